@@ -0,0 +1,52 @@
+"""Compare the SVG and WebGL renderers on one play.
+
+There is no browser here to measure frame rates in, so this reports what
+drives client playback cost instead: traces per frame by type, payload size,
+and server build time::
+
+    python -m app.cli.compare_renderers --game 2022090800 --play 56
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from dataclasses import replace
+from app.dependencies import create_backend
+from app.modules.animation import AnimationConfig, get_color_manager
+from app.services import crud
+from app.services.figures import build_figure
+
+
+def compare(game_id: int, play_id: int, static_field: bool, repeat: int) -> None:
+    frames = asyncio.run(crud.get_play_frames(create_backend(), game_id, play_id))
+    base_config = AnimationConfig(static_field=static_field, redraw=not static_field)
+
+    print(f"{'renderer':<8} {'frames':>6} {'traces/frame':<28} {'bytes':>11} {'build':>8}")
+    for renderer in ("svg", "webgl"):
+        config = replace(base_config, renderer=renderer)
+        build_seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fig = build_figure(*frames, get_color_manager(), config)
+            build_seconds.append(time.perf_counter() - start)
+
+        frame_traces = Counter(trace.type for trace in fig.frames[-1].data)
+        trace_summary = ", ".join(f"{n} {kind}" for kind, n in frame_traces.items())
+        print(
+            f"{renderer:<8} {len(fig.frames):>6} {trace_summary:<28} "
+            f"{len(fig.to_json()):>11,} {min(build_seconds):>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", type=int, required=True)
+    parser.add_argument("--play", type=int, required=True)
+    parser.add_argument(
+        "--static-field", action=argparse.BooleanOptionalAction, default=True
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    compare(args.game, args.play, args.static_field, args.repeat)
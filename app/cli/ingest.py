@@ -0,0 +1,333 @@
+"""Load the Big Data Bowl CSVs into Postgres or the Parquet store.
+
+games.csv and plays.csv are loaded first. Then every tracking_week_*.csv is
+streamed in chunks on its own worker process. Each chunk is cleaned and its
+column types narrowed once, then written one game at a time. Every game
+replaces whatever was stored for it before, so a run can be repeated or resumed
+without duplicating rows::
+
+    python -m app.cli.ingest --data-dir data/nfl-big-data-bowl-2025 --target postgres
+    python -m app.cli.ingest --data-dir data/nfl-big-data-bowl-2025 --target parquet
+"""
+
+import argparse
+import io
+import os
+import re
+import shutil
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Final, Literal, Protocol, Self
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Engine
+from app.config import get_engine, get_settings
+from app.services.backends.base import GAME_COLUMNS, PLAY_COLUMNS, TRACKING_COLUMNS
+from app.services.cleaning import clean_tracking_data
+
+Target = Literal["postgres", "parquet"]
+
+GAME_INGEST_COLUMNS: Final[list[str]] = [*GAME_COLUMNS, "week"]
+PLAY_INGEST_COLUMNS: Final[list[str]] = [*PLAY_COLUMNS, "gameclock"]
+TRACKING_FILE_PATTERN: Final[re.Pattern] = re.compile(r"tracking_week_(\d+)\.csv$")
+
+POSTGRES_SCHEMA: Final[list[str]] = [
+    """CREATE TABLE IF NOT EXISTS games (
+        gameid INTEGER PRIMARY KEY,
+        hometeamabbr TEXT,
+        visitorteamabbr TEXT,
+        week SMALLINT
+    )""",
+    """CREATE TABLE IF NOT EXISTS plays (
+        gameid INTEGER,
+        playid INTEGER,
+        playdescription TEXT,
+        down SMALLINT,
+        quarter SMALLINT,
+        absoluteyardlinenumber DOUBLE PRECISION,
+        yardstogo SMALLINT,
+        gameclock TEXT,
+        PRIMARY KEY (gameid, playid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS tracking_data (
+        gameid INTEGER,
+        playid INTEGER,
+        nflid INTEGER,
+        playdirection TEXT,
+        club TEXT,
+        frameid SMALLINT,
+        s DOUBLE PRECISION,
+        a DOUBLE PRECISION,
+        dir DOUBLE PRECISION,
+        dis DOUBLE PRECISION,
+        displayname TEXT,
+        x DOUBLE PRECISION,
+        y DOUBLE PRECISION
+    )""",
+    "CREATE INDEX IF NOT EXISTS tracking_data_play_idx"
+    " ON tracking_data (gameid, playid)",
+]
+
+
+def read_csv_columns(
+    path: Path, columns: list[str], chunksize: int | None = None
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Read only the named columns, matching the CSVs' camelCase headers."""
+    frames = pd.read_csv(
+        path,
+        usecols=lambda column: column.lower() in columns,
+        chunksize=chunksize,
+    )
+    if chunksize is None:
+        return frames.rename(columns=str.lower)[columns]
+    return (chunk.rename(columns=str.lower)[columns] for chunk in frames)
+
+
+class Sink(Protocol):
+    """Where ingested games, plays and tracking rows are stored."""
+
+    def prepare(self: Self) -> None: ...
+
+    def write_games(self: Self, games: pd.DataFrame) -> None: ...
+
+    def write_plays(self: Self, plays: pd.DataFrame) -> None: ...
+
+    def write_tracking(
+        self: Self, week: int, game_id: int, rows: pd.DataFrame, replace: bool
+    ) -> None:
+        """Store one game's rows, first dropping what was there if replace."""
+        ...
+
+
+class PostgresSink:
+    """Bulk loads with COPY, one transaction per game."""
+
+    def __init__(self: Self, engine: Engine) -> None:
+        self.engine = engine
+
+    def prepare(self: Self) -> None:
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                for statement in POSTGRES_SCHEMA:
+                    cursor.execute(statement)
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _replace(
+        self: Self, table: str, game_ids: list[int], rows: pd.DataFrame
+    ) -> None:
+        buffer = io.StringIO()
+        rows.to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                if game_ids:
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE gameid = ANY(%s)", (game_ids,)
+                    )
+                columns = ",".join(rows.columns)
+                cursor.copy_expert(
+                    f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def write_games(self: Self, games: pd.DataFrame) -> None:
+        self._replace("games", games["gameid"].unique().tolist(), games)
+
+    def write_plays(self: Self, plays: pd.DataFrame) -> None:
+        self._replace("plays", plays["gameid"].unique().tolist(), plays)
+
+    def write_tracking(
+        self: Self, week: int, game_id: int, rows: pd.DataFrame, replace: bool
+    ) -> None:
+        self._replace("tracking_data", [game_id] if replace else [], rows)
+
+
+class ParquetSink:
+    """Writes the layout ParquetBackend reads, one directory per game."""
+
+    def __init__(self: Self, root: Path) -> None:
+        self.root = root
+
+    def prepare(self: Self) -> None:
+        (self.root / "tracking").mkdir(parents=True, exist_ok=True)
+
+    def _replace_file(self: Self, name: str, rows: pd.DataFrame) -> None:
+        # Keep other games' rows, replace these games', then swap the file in
+        path = self.root / name
+        if path.exists():
+            existing = pd.read_parquet(path)
+            rows = pd.concat(
+                [existing[~existing["gameid"].isin(rows["gameid"])], rows],
+                ignore_index=True,
+            )
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        rows.to_parquet(tmp_path, index=False)
+        tmp_path.replace(path)
+
+    def write_games(self: Self, games: pd.DataFrame) -> None:
+        self._replace_file("games.parquet", games)
+
+    def write_plays(self: Self, plays: pd.DataFrame) -> None:
+        self._replace_file("plays.parquet", plays)
+
+    def write_tracking(
+        self: Self, week: int, game_id: int, rows: pd.DataFrame, replace: bool
+    ) -> None:
+        directory = self.root / "tracking" / f"week={week}" / f"gameid={game_id}"
+        if replace:
+            shutil.rmtree(directory, ignore_errors=True)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Partition columns live in the directory names, not the files
+        table = pa.Table.from_pandas(
+            rows.drop(columns=["gameid"]), preserve_index=False
+        )
+        part = len(list(directory.glob("*.parquet")))
+        tmp_path = directory / f".part-{part}.tmp"
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(directory / f"part-{part}.parquet")
+
+
+def make_sink(target: Target, parquet_root: Path) -> Sink:
+    if target == "parquet":
+        return ParquetSink(parquet_root)
+
+    # Workers are forked with the parent's pool; never reuse its connections
+    engine = get_engine()
+    engine.dispose(close=False)
+    return PostgresSink(engine)
+
+
+def ingest_tracking_file(
+    path: Path,
+    weeks: dict[int, int],
+    target: Target,
+    parquet_root: Path,
+    chunksize: int,
+) -> dict:
+    """Stream one week's tracking CSV into the sink. Runs in a worker process."""
+    start = time.perf_counter()
+    sink = make_sink(target, parquet_root)
+    file_week = int(TRACKING_FILE_PATTERN.search(path.name).group(1))
+
+    loaded: set[int] = set()
+    rows_written = 0
+
+    def flush(game_id: int, rows: pd.DataFrame) -> None:
+        nonlocal rows_written
+        # A game split across non-adjacent chunks is appended after its first part
+        week = weeks.get(game_id, file_week)
+        sink.write_tracking(week, game_id, rows, replace=game_id not in loaded)
+        loaded.add(game_id)
+        rows_written += len(rows)
+
+    pending = None
+    for chunk in read_csv_columns(path, TRACKING_COLUMNS, chunksize):
+        chunk = clean_tracking_data(chunk)
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+
+        # The chunk's last game may continue in the next chunk, so hold it back
+        last_game = chunk["gameid"].iloc[-1]
+        is_last_game = chunk["gameid"] == last_game
+        pending = chunk[is_last_game]
+        for game_id, rows in chunk[~is_last_game].groupby("gameid", sort=False):
+            flush(int(game_id), rows)
+
+    if pending is not None and not pending.empty:
+        flush(int(pending["gameid"].iloc[0]), pending)
+
+    return {
+        "file": path.name,
+        "games": len(loaded),
+        "rows": rows_written,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def ingest(
+    data_dir: Path,
+    target: Target,
+    parquet_root: Path,
+    workers: int,
+    chunksize: int,
+    weeks: list[int],
+) -> None:
+    sink = make_sink(target, parquet_root)
+    sink.prepare()
+
+    games = read_csv_columns(data_dir / "games.csv", GAME_INGEST_COLUMNS)
+    plays = read_csv_columns(data_dir / "plays.csv", PLAY_INGEST_COLUMNS)
+    if weeks:
+        games = games[games["week"].isin(weeks)]
+        plays = plays[plays["gameid"].isin(games["gameid"])]
+    sink.write_games(games)
+    sink.write_plays(plays)
+    print(f"Loaded {len(games)} games and {len(plays)} plays")
+
+    tracking_files = sorted(
+        path
+        for path in data_dir.glob("tracking_week_*.csv")
+        if not weeks
+        or int(TRACKING_FILE_PATTERN.search(path.name).group(1)) in weeks
+    )
+    game_weeks = dict(zip(games["gameid"], games["week"]))
+
+    run_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                ingest_tracking_file, path, game_weeks, target, parquet_root, chunksize
+            ): path
+            for path in tracking_files
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            print(
+                f"{result['file']}: {result['rows']:,} rows, {result['games']} games "
+                f"in {result['seconds']:.1f}s"
+            )
+
+    elapsed = time.perf_counter() - run_start
+    print(f"Loaded {len(tracking_files)} tracking files in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, required=True)
+    parser.add_argument(
+        "--target", choices=["postgres", "parquet"], default=settings.data_backend
+    )
+    parser.add_argument("--parquet-root", type=Path, default=settings.parquet_root)
+    parser.add_argument("--week", type=int, action="append", default=[])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1_000_000,
+        help="Tracking rows read per chunk",
+    )
+    args = parser.parse_args()
+
+    ingest(
+        args.data_dir,
+        args.target,
+        args.parquet_root,
+        args.workers,
+        args.chunksize,
+        args.week,
+    )
@@ -0,0 +1,173 @@
+"""Pre-render plays to standalone HTML/JSON files.
+
+Plays are enumerated through the crud layer and rendered on a process pool,
+with a bounded number of plays in flight. Plays whose files already exist are
+skipped, so an interrupted run can simply be restarted::
+
+    python -m app.cli.render --week 1 --out archive --workers 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pandas as pd
+from app.dependencies import create_backend
+from app.modules.animation import AnimationConfig, get_color_manager
+from app.services import crud
+from app.services.backends import DataBackend
+from app.services.figures import build_figure
+
+FORMATS = ("html", "json")
+
+
+def output_paths(out_dir: Path, key: tuple[int, int], formats: list[str]) -> list[Path]:
+    game_id, play_id = key
+    return [out_dir / str(game_id) / f"{play_id}.{fmt}" for fmt in formats]
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    # Write then rename, so a killed run never leaves a file that looks complete
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp_path.write_text(content)
+    tmp_path.replace(path)
+
+
+def render_play(
+    key: tuple[int, int],
+    game_data: pd.DataFrame,
+    play_data: pd.DataFrame,
+    tracking_data: pd.DataFrame,
+    out_dir: Path,
+    formats: list[str],
+    config: AnimationConfig,
+) -> dict:
+    """Render one play to disk. Runs in a worker process."""
+    start = time.perf_counter()
+    fig = build_figure(
+        game_data, play_data, tracking_data, get_color_manager(), config
+    )
+    build_seconds = time.perf_counter() - start
+
+    paths = output_paths(out_dir, key, formats)
+    paths[0].parent.mkdir(parents=True, exist_ok=True)
+    for fmt, path in zip(formats, paths):
+        if fmt == "html":
+            _write_atomic(path, fig.to_html(include_plotlyjs="cdn", full_html=True))
+        else:
+            _write_atomic(path, fig.to_json())
+
+    return {
+        "game_id": key[0],
+        "play_id": key[1],
+        "frames": len(fig.frames),
+        "build_seconds": round(build_seconds, 4),
+        "total_seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+async def list_plays(
+    backend: DataBackend, weeks: list[int], games: list[int]
+) -> list[tuple[int, int]]:
+    """Enumerate (game id, play id) pairs for the requested weeks and games."""
+    game_ids = list(games)
+    for week in weeks:
+        games_in_week = await crud.get_games_by_week(backend, week)
+        game_ids += [game["gameid"] for game in games_in_week]
+
+    keys = []
+    for game_id in dict.fromkeys(game_ids):
+        keys += await crud.get_batch_play_keys(backend, [], game_id)
+    return keys
+
+
+async def render_plays(
+    keys: list[tuple[int, int]],
+    out_dir: Path,
+    formats: list[str],
+    config: AnimationConfig,
+    workers: int,
+    queue_size: int,
+) -> None:
+    backend = create_backend()
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(queue_size)
+    log_path = out_dir / "render_log.jsonl"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    done = failed = 0
+    run_start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, log_path.open("a") as log:
+
+        async def render(key: tuple[int, int], frames: tuple) -> None:
+            nonlocal done, failed
+            try:
+                result = await loop.run_in_executor(
+                    pool, render_play, key, *frames, out_dir, formats, config
+                )
+            except Exception as e:
+                failed += 1
+                result = {"game_id": key[0], "play_id": key[1], "error": str(e)}
+                print(f"[{done + failed}/{len(keys)}] {key[0]}/{key[1]} failed: {e}")
+            else:
+                done += 1
+                print(
+                    f"[{done + failed}/{len(keys)}] {key[0]}/{key[1]} "
+                    f"{result['frames']} frames in {result['total_seconds']:.2f}s"
+                )
+            finally:
+                slots.release()
+            log.write(json.dumps(result) + "\n")
+
+        tasks = []
+        async for key, *frames in crud.iter_play_frames(backend, keys):
+            # Bound the plays waiting on the pool so memory stays flat
+            await slots.acquire()
+            tasks.append(asyncio.create_task(render(key, tuple(frames))))
+        await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - run_start
+    print(f"Rendered {done} plays, {failed} failed, in {elapsed:.1f}s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    backend = create_backend()
+    keys = await list_plays(backend, args.week, args.game)
+    todo = [
+        key
+        for key in keys
+        if not all(path.exists() for path in output_paths(args.out, key, args.formats))
+    ]
+    print(f"{len(keys)} plays, {len(keys) - len(todo)} already rendered")
+
+    config = AnimationConfig(static_field=True, redraw=False, client_hover=True)
+    await render_plays(
+        todo, args.out, args.formats, config, args.workers, args.queue_size
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--week", type=int, action="append", default=[])
+    parser.add_argument("--game", type=int, action="append", default=[])
+    parser.add_argument("--out", type=Path, default=Path("archive"))
+    parser.add_argument(
+        "--formats", nargs="+", choices=FORMATS, default=list(FORMATS)
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="Plays fetched ahead of the pool (default: 2 x workers)",
+    )
+    args = parser.parse_args()
+    if not args.week and not args.game:
+        parser.error("pass at least one --week or --game")
+    args.queue_size = args.queue_size or 2 * args.workers
+
+    asyncio.run(main(args))
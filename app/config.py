@@ -1,23 +1,75 @@
 # app/config.py
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Self
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, Self
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.orm import sessionmaker
 
 
 # Define a Pydantic settings class to handle environment variables
 class Settings(BaseSettings):
-    db_user: str
-    db_password: str
-    db_name: str
-    db_hostname: str
+    db_user: str = ""
+    db_password: str = ""
+    db_name: str = ""
+    db_hostname: str = ""
+
+    # Connection pool, shared by the sync and async engines
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # Query Postgres through an asyncio driver instead of the threadpool
+    db_async: bool = False
+    db_async_driver: str = "asyncpg"
+
+    # Where crud reads from: Postgres, or a local partitioned Parquet store
+    data_backend: Literal["postgres", "parquet"] = "postgres"
+    parquet_root: Path = Path("data/parquet")
+
+    # Rendered figure cache
+    figure_cache_dir: Path = Path(".cache/figures")
+    figure_cache_memory_entries: int = 128
+    figure_cache_disk_bytes: int = 1024**3
+
+    # Whole games held in memory once /plays/{game_id} has prefetched them
+    game_cache_entries: int = 4
+
+    # Validate /play responses per column and encode them with orjson
+    fast_json: bool = False
+
+    # Stream batch tracking rows through a server-side cursor this many at a
+    # time, instead of reading BATCH_CHUNK_SIZE plays whole; 0 turns it off
+    tracking_stream_rows: int = 0
+
+    # Let requests ask to be profiled with an X-Profile header or ?profile=
+    profiling_enabled: bool = False
+    profile_dir: Path = Path(".cache/profiles")
 
     @property
     def database_url(self: Self) -> str:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_hostname}/{self.db_name}"
 
+    @property
+    def async_database_url(self: Self) -> str:
+        return f"postgresql+{self.db_async_driver}://{self.db_user}:{self.db_password}@{self.db_hostname}/{self.db_name}"
+
+    @property
+    def pool_options(self: Self) -> dict:
+        return {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_pre_ping": self.db_pool_pre_ping,
+        }
+
     class Config:
         env_file = ".env"  # Load environment variables from .env file
 
@@ -28,7 +80,26 @@ def get_settings() -> Settings:
     return Settings()
 
 
-# Use settings to configure the database
-settings = get_settings()
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Engines are created, and SQLAlchemy and the drivers imported, on first use,
+# so importing the app stays fast and Parquet deployments never load them
+@lru_cache()
+def get_engine() -> "Engine":
+    from sqlalchemy import create_engine
+
+    settings = get_settings()
+    return create_engine(settings.database_url, **settings.pool_options)
+
+
+@lru_cache()
+def get_session_factory() -> "sessionmaker":
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+@lru_cache()
+def get_async_engine() -> "AsyncEngine":
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    settings = get_settings()
+    return create_async_engine(settings.async_database_url, **settings.pool_options)
@@ -1,12 +1,39 @@
-from app.config import SessionLocal
-from sqlalchemy.orm import Session
+from app.config import (
+    get_async_engine,
+    get_engine,
+    get_session_factory,
+    get_settings,
+)
+from app.services import backends
+from app.services.backends import DataBackend
 from collections.abc import Generator
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
 
 
 # Dependency to get the database session
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+def get_db() -> Generator["Session", None, None]:
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
+
+
+# Backends only hold pooled engines or dataset handles, so share one per process
+@lru_cache()
+def create_backend() -> DataBackend:
+    settings = get_settings()
+    if settings.data_backend == "parquet":
+        return backends.ParquetBackend(settings.parquet_root)
+    if settings.db_async:
+        return backends.AsyncSqlBackend(get_async_engine())
+    return backends.SqlBackend(get_engine())
+
+
+# Dependency to get the configured data backend
+async def get_backend() -> DataBackend:
+    return create_backend()
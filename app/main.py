@@ -1,9 +1,63 @@
-from fastapi import FastAPI
-from app.routers import games, plays, weeks
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from app.dependencies import create_backend
+from app.modules.animation import AnimationConfigError
+from app.routers import games, metrics, plays, weeks
+from app.utils.metrics import REQUEST_SECONDS, REQUESTS
+from app.utils.profiling import ProfilingMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Set up the backend, and its engine, at startup rather than on import
+    create_backend()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Include the API router
 app.include_router(games.router, prefix="/api")
 app.include_router(plays.router, prefix="/api")
 app.include_router(weeks.router, prefix="/api")
+
+# Prometheus scrapes /metrics at the root
+app.include_router(metrics.router)
+
+
+# Raised while building a figure route's AnimationConfig from its query
+# parameters, or when the config selects none of the play's frames
+@app.exception_handler(AnimationConfigError)
+async def animation_config_error(
+    request: Request, exc: AnimationConfigError
+) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
+@app.middleware("http")
+async def record_request_metrics(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template so path parameters don't explode cardinality
+        route = request.scope.get("route")
+        labels = {
+            "method": request.method,
+            "route": getattr(route, "path", "unmatched"),
+            "status": str(status),
+        }
+        REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+        REQUESTS.inc(**labels)
+
+
+# Only profiles when enabled, so normal deployments pay nothing for it
+app.add_middleware(ProfilingMiddleware)
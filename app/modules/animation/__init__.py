@@ -1,25 +1,32 @@
 from app.modules.animation.animator import PlayAnimator, animate_play
-from app.modules.animation.colors import ColorManager
+from app.modules.animation.colors import ColorManager, get_color_manager
 from app.modules.animation.types import (
     AnimationConfig,
+    AnimationConfigError,
     ColorProvider,
     FrameData,
     FrameInfo,
     PlayerData,
     PlayDirection,
     PlayInfo,
+    PlayTracking,
+    Renderer,
 )
 
 __all__ = [
     "animate_play",
     "PlayAnimator",
     "ColorManager",
+    "get_color_manager",
     "AnimationConfig",
+    "AnimationConfigError",
     "ColorProvider",
     "FrameData",
     "FrameInfo",
     "PlayerData",
     "PlayDirection",
     "PlayInfo",
+    "PlayTracking",
+    "Renderer",
     "TeamColors",
 ]
@@ -1,6 +1,6 @@
-from app.modules.animation.colors import ColorManager
+from app.modules.animation.colors import get_color_manager
 from app.modules.animation.animator import PlayAnimator
-from app.modules.animation.types import AnimationConfig
+from app.modules.animation.types import AnimationConfig, PlayTracking, Renderer
 import plotly.graph_objects as go
 import pandas as pd
 
@@ -8,11 +8,16 @@ import pandas as pd
 def animate_play(
     selected_game_df: pd.DataFrame,
     selected_play_df: pd.DataFrame,
-    selected_tracking_df: pd.DataFrame,
+    selected_tracking_df: pd.DataFrame | PlayTracking,
     frame_duration: int = 100,
     transition_duration: int = 0,
     slider_transition_duration: int = 300,
     redraw: bool = True,
+    static_field: bool = False,
+    frame_stride: int = 1,
+    max_frames: int | None = None,
+    renderer: Renderer = "svg",
+    client_hover: bool = False,
 ) -> go.Figure:
     """Create an animated visualization of an NFL play."""
     config = AnimationConfig(
@@ -20,13 +25,18 @@ def animate_play(
         transition_duration=transition_duration,
         slider_transition_duration=slider_transition_duration,
         redraw=redraw,
+        static_field=static_field,
+        frame_stride=frame_stride,
+        max_frames=max_frames,
+        renderer=renderer,
+        client_hover=client_hover,
     )
 
     animator = PlayAnimator(
         game_df=selected_game_df,
         play_df=selected_play_df,
         tracking_df=selected_tracking_df,
-        color_provider=ColorManager(),
+        color_provider=get_color_manager(),
         config=config,
     )
 
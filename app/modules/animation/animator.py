@@ -1,35 +1,89 @@
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from functools import cached_property
+import itertools
+import math
 from typing import Self
 import numpy as np
+from numpy.typing import NDArray
 import pandas as pd
 import plotly.graph_objects as go
-from app.modules.animation.colors import ColorManager
+from app.modules.animation.colors import get_color_manager
+from app.modules.animation.frames import FrameIndex
 from app.modules.animation.types import (
     PlayInfo,
     AnimationConfig,
+    AnimationConfigError,
+    FrameData,
     FrameInfo,
     ColorProvider,
     PlayerData,
+    PlayTracking,
+    Renderer,
 )
+from app.utils.metrics import timed
+
+YDS_PER_SEC_TO_MPH = 2.04545
+
+# Matches the labels built by _server_hover; <extra></extra> hides the trace name
+CLIENT_HOVER_TEMPLATE = (
+    "Name: %{text}<br>"
+    "Speed: %{customdata[0]:.2f} MPH<br>"
+    "Acceleration: %{customdata[1]:.2f} MPH/s<br>"
+    "Direction: %{customdata[2]:.2f}°<br>"
+    "<extra></extra>"
+)
+
 
 @dataclass
 class PlayAnimator:
     """Handles the animation of NFL plays."""
     game_df: pd.DataFrame
     play_df: pd.DataFrame
-    tracking_df: pd.DataFrame
-    color_provider: ColorProvider
+    tracking_df: pd.DataFrame | PlayTracking
+    color_provider: ColorProvider = field(default_factory=get_color_manager)
     config: AnimationConfig = AnimationConfig()
 
     def __post_init__(self: Self) -> None:
         """Initialize play info and team colors after instance creation."""
-        self.play_info = self._extract_play_info()
-        self.team_colors = self._setup_team_colors()
+        with timed("animation_info"):
+            if isinstance(self.tracking_df, PlayTracking):
+                self.tracking = self.tracking_df
+            else:
+                self.tracking = PlayTracking.from_dataframe(self.tracking_df)
+
+            self.play_info = self._extract_play_info()
+            self.team_colors = self._setup_team_colors()
+            self.frame_index = FrameIndex(self.tracking)
+            self.frame_ids, self.frame_stride = self._select_frames()
+        self.frame_duration = self.config.frame_duration * self.frame_stride
+        # Plotly only animates WebGL traces on a full redraw
+        self.redraw = self.config.redraw or self.config.renderer == "webgl"
+
+    def _select_frames(self: Self) -> tuple[NDArray[np.int_], int]:
+        """Apply the config's frame window, stride and frame budget."""
+        frame_ids = self.frame_index.frame_ids
+        if self.config.first_frame is not None:
+            frame_ids = frame_ids[frame_ids >= self.config.first_frame]
+        if self.config.last_frame is not None:
+            frame_ids = frame_ids[frame_ids <= self.config.last_frame]
+
+        if not len(frame_ids):
+            raise AnimationConfigError(
+                f"No frames between first_frame {self.config.first_frame} "
+                f"and last_frame {self.config.last_frame}"
+            )
+
+        stride = self.config.frame_stride
+        if self.config.max_frames is not None:
+            stride = max(stride, math.ceil(len(frame_ids) / self.config.max_frames))
+        return frame_ids[::stride], stride
+
     def _extract_play_info(self: Self) -> PlayInfo:
         """Extract play information from the dataframes."""
         los = self.play_df["absolute_yardline_number"].values[0]
         yards_to_go = self.play_df["yards_to_go"].values[0]
-        play_direction = self.tracking_df["play_direction"].values[0]
+        play_direction = self.tracking.play_direction
         
         first_down_marker = (
             los + yards_to_go if play_direction == "right" else los - yards_to_go
@@ -50,7 +104,7 @@ class PlayAnimator:
 
     def _setup_team_colors(self: Self) -> dict[str, list[str]]:
         """Set up team color schemes."""
-        team_combos = list(set(self.tracking_df["club"].unique()) - {"football"})
+        team_combos = list(set(self.tracking.clubs) - {"football"})
         return self.color_provider.get_contrasting_pairs(team_combos[0], team_combos[1])
 
     def _format_play_description(self: Self, description: str) -> str:
@@ -142,75 +196,118 @@ class PlayAnimator:
             for x_min in [0, 110]
         ]
 
-    def _create_player_traces(self: Self, frame_id: int) -> list[go.Scatter]:
-        """Create player position traces for a given frame."""
-        YDS_PER_SEC_TO_MPH = 2.04545
+    def _create_player_traces(
+        self: Self, frame_id: int, with_names: bool = False
+    ) -> FrameData:
+        """Create player position traces for a given frame.
+
+        With client_hover, only the traces passed with_names carry player names;
+        plotly keeps them when later frames update x, y and customdata.
+        """
         traces = []
-        
-        for team in self.tracking_df["club"].unique():
-            plot_df = self.tracking_df[
-                (self.tracking_df["club"] == team)
-                & (self.tracking_df["frame_id"] == frame_id)
-            ]
-            
-            marker = go.scatter.Marker(
+
+        # Player traces are the only ones redrawn every frame, so they are the
+        # ones that move to WebGL
+        if self.config.renderer == "webgl":
+            trace_type, marker_type = go.Scattergl, go.scattergl.Marker
+        else:
+            trace_type, marker_type = go.Scatter, go.scatter.Marker
+
+        for team in self.frame_index.clubs:
+            # Hover names are matched to points by index, so keep every player
+            # in place when they are only sent once
+            plot_df = self.frame_index.get(
+                frame_id, team, keep_missing=self.config.client_hover
+            )
+
+            marker = marker_type(
                 color=self.team_colors[team][0],
-                line=go.scatter.marker.Line(width=2, color=self.team_colors[team][1]),
+                line=dict(width=2, color=self.team_colors[team][1]),
                 size=self.config.marker_size,
             )
             
-            if team != "football":
-                hover_text = [
-                    f"Name: {player.display_name}<br>"
-                    f"Speed: {round(player.speed * YDS_PER_SEC_TO_MPH, 2)} MPH<br>"
-                    f"Acceleration: {round(player.acceleration * YDS_PER_SEC_TO_MPH, 2)} MPH/s<br>"
-                    f"Direction: {round(player.direction, 2)}°<br>"
-                    for player in (
-                        PlayerData(
-                            x=x, y=y, speed=s, acceleration=a,
-                            direction=d, display_name=n
-                        )
-                        for x, y, s, a, d, n in zip(
-                            plot_df["x"], plot_df["y"], plot_df["s"],
-                            plot_df["a"], plot_df["dir"], plot_df["display_name"]
-                        )
-                    )
-                ]
-                
-                traces.append(
-                    go.Scatter(
-                        x=plot_df["x"],
-                        y=plot_df["y"],
-                        mode="markers",
-                        marker=marker,
-                        name=team,
-                        text=hover_text,
-                        hoverinfo="text",
-                        hoverlabel=dict(font=dict(size=16)),
-                    )
-                )
+            if team == "football":
+                hover = dict(hoverinfo="none")
+            elif self.config.client_hover:
+                hover = self._client_hover(plot_df, with_names)
             else:
-                traces.append(
-                    go.Scatter(
-                        x=plot_df["x"],
-                        y=plot_df["y"],
-                        mode="markers",
-                        marker=marker,
-                        name=team,
-                        hoverinfo="none",
-                    )
+                hover = self._server_hover(plot_df)
+
+            traces.append(
+                trace_type(
+                    x=plot_df["x"],
+                    y=plot_df["y"],
+                    mode="markers",
+                    marker=marker,
+                    name=team,
+                    **hover,
                 )
+            )
                 
         return traces
 
-    def _create_frame(self: Self, frame_id: int) -> FrameInfo:
-        """Create a single animation frame."""
-        data = (
+    def _server_hover(self: Self, plot_df: dict[str, NDArray]) -> dict:
+        """Format a hover label for every player in Python."""
+        hover_text = [
+            f"Name: {player.display_name}<br>"
+            f"Speed: {round(player.speed * YDS_PER_SEC_TO_MPH, 2)} MPH<br>"
+            f"Acceleration: {round(player.acceleration * YDS_PER_SEC_TO_MPH, 2)} MPH/s<br>"
+            f"Direction: {round(player.direction, 2)}°<br>"
+            for player in (
+                PlayerData(
+                    x=x, y=y, speed=s, acceleration=a,
+                    direction=d, display_name=n
+                )
+                for x, y, s, a, d, n in zip(
+                    plot_df["x"], plot_df["y"], plot_df["s"],
+                    plot_df["a"], plot_df["dir"], plot_df["display_name"]
+                )
+            )
+        ]
+        return dict(
+            text=hover_text,
+            hoverinfo="text",
+            hoverlabel=dict(font=dict(size=16)),
+        )
+
+    def _client_hover(
+        self: Self, plot_df: dict[str, NDArray], with_names: bool
+    ) -> dict:
+        """Send numeric customdata and let the browser format the hover label."""
+        customdata = np.round(
+            np.column_stack(
+                (
+                    plot_df["s"] * YDS_PER_SEC_TO_MPH,
+                    plot_df["a"] * YDS_PER_SEC_TO_MPH,
+                    plot_df["dir"],
+                )
+            ),
+            2,
+        )
+        hover = dict(
+            customdata=customdata,
+            hovertemplate=CLIENT_HOVER_TEMPLATE,
+            hoverlabel=dict(font=dict(size=16)),
+        )
+        if with_names:
+            hover["text"] = plot_df["display_name"]
+        return hover
+
+    def _create_static_traces(self: Self) -> list[go.Scatter]:
+        """Create the field, line and endzone traces that never move."""
+        return (
             self._create_field_markers()
             + self._create_line_markers()
             + self._create_endzone_colors()
-            + self._create_player_traces(frame_id)
         )
+
+    def _create_frame(self: Self, frame_id: int, with_names: bool = False) -> FrameInfo:
+        """Create a single animation frame."""
+        players = self._create_player_traces(frame_id, with_names)
+        if self.config.static_field:
+            data = players
+        else:
+            data = self._create_static_traces() + players
         
         return FrameInfo(
             frame_id=frame_id,
@@ -227,8 +324,8 @@ class PlayAnimator:
                         None,
                         {
                             "frame": {
-                                "duration": self.config.frame_duration,
-                                "redraw": self.config.redraw
+                                "duration": self.frame_duration,
+                                "redraw": self.redraw
                             },
                             "fromcurrent": True,
                             "mode": "immediate",
@@ -360,48 +457,94 @@ class PlayAnimator:
 
     def create_animation(self: Self) -> go.Figure:
         """Create the complete play animation."""
-        frame_ids = sorted(self.tracking_df["frame_id"].unique())
-        frames = [self._create_frame(frame_id) for frame_id in frame_ids]
+        with timed("animation_frames"):
+            frames = [
+                self._create_frame(frame_id) for frame_id in self.frame_ids
+            ]
         
+        with timed("animation_figure"):
+            fig = self._create_base_figure(frames[0])
+            fig.frames = self._create_plotly_frames(
+                frames if self.config.static_field else frames[1:]
+            )
+            return fig
+
+    def iter_animation(
+        self: Self, batch_size: int = 10
+    ) -> Iterator[go.Figure | list[go.Frame]]:
+        """Yield the figure without frames, then its frames in batches.
+
+        Appending the batches to the figure's frames, in order, gives the
+        figure create_animation returns.
+        """
+        with timed("animation_figure"):
+            first = self._create_frame(self.frame_ids[0])
+            yield self._create_base_figure(first)
+
+        # Without a static field, the base figure's data is the first frame
+        frames = map(self._create_frame, self.frame_ids[1:])
+        if self.config.static_field:
+            frames = itertools.chain([first], frames)
+        while True:
+            with timed("animation_frames"):
+                batch = list(itertools.islice(frames, batch_size))
+            if not batch:
+                return
+            yield self._create_plotly_frames(batch)
+
+    @cached_property
+    def _player_trace_ids(self: Self) -> list[int]:
+        """Indices of the player traces that follow the static field traces."""
+        n_static = len(self._create_static_traces())
+        return list(range(n_static, n_static + len(self.frame_index.clubs)))
+
+    def _create_plotly_frames(self: Self, frames: list[FrameInfo]) -> list[go.Frame]:
+        """Wrap frames for the figure built by _create_base_figure."""
+        if not self.config.static_field:
+            return [go.Frame(data=f.data, name=f.name) for f in frames]
+
+        # Static geometry lives only in the base figure; frames update the
+        # player traces that follow it by index.
+        return [
+            go.Frame(data=f.data, name=f.name, traces=self._player_trace_ids)
+            for f in frames
+        ]
+
+    def _create_base_figure(self: Self, first: FrameInfo) -> go.Figure:
+        """Create the figure with all components but its frames."""
         updatemenus, sliders = self._create_animation_controls()
-        
-        return self._create_figure(frames, updatemenus, sliders)
-
-    def _create_figure(
-        self: Self,
-        frames: list[FrameInfo],
-        updatemenus: list[dict],
-        sliders: dict,
-    ) -> go.Figure:
-        """Create the final figure with all components."""
-        
+
         # Add slider steps
         sliders["steps"] = [
             {
                 "args": [
-                    [frame.name],
+                    [str(frame_id)],
                     {
                         "frame": {
-                            "duration": self.config.frame_duration,
-                            "redraw": self.config.redraw
+                            "duration": self.frame_duration,
+                            "redraw": self.redraw
                         },
                         "mode": "immediate",
                         "transition": {"duration": 0},
                     },
                 ],
-                "label": frame.name,
+                "label": str(frame_id),
                 "method": "animate",
             }
-            for frame in frames
+            for frame_id in self.frame_ids
         ]
         
         layout = self._create_layout(updatemenus, sliders)
-        
-        fig = go.Figure(
-            data=frames[0].data,
-            layout=layout,
-            frames=[go.Frame(data=f.data, name=f.name) for f in frames[1:]]
-        )
+
+        # Frames leave hover names out; the base figure carries them once
+        if self.config.client_hover:
+            first_data = self._create_frame(first.frame_id, with_names=True).data
+        else:
+            first_data = first.data
+
+        if self.config.static_field:
+            first_data = self._create_static_traces() + first_data
+        fig = go.Figure(data=first_data, layout=layout)
         
         # Enable WebGL rendering and other display options
         fig.update_layout(template="plotly_dark")
@@ -412,7 +555,6 @@ class PlayAnimator:
         
         return fig
 
-
 def animate_play(
     selected_game_df: pd.DataFrame,
     selected_play_df: pd.DataFrame,
@@ -421,6 +563,11 @@ def animate_play(
     transition_duration: int = 0,
     slider_transition_duration: int = 300,
     redraw: bool = True,
+    static_field: bool = False,
+    frame_stride: int = 1,
+    max_frames: int | None = None,
+    renderer: Renderer = "svg",
+    client_hover: bool = False,
 ) -> go.Figure:
     """Create an animated visualization of an NFL play."""
     config = AnimationConfig(
@@ -428,13 +575,18 @@ def animate_play(
         transition_duration=transition_duration,
         slider_transition_duration=slider_transition_duration,
         redraw=redraw,
+        static_field=static_field,
+        frame_stride=frame_stride,
+        max_frames=max_frames,
+        renderer=renderer,
+        client_hover=client_hover,
     )
     
     animator = PlayAnimator(
         game_df=selected_game_df,
         play_df=selected_play_df,
         tracking_df=selected_tracking_df,
-        color_provider=ColorManager(),
+        color_provider=get_color_manager(),
         config=config,
     )
     
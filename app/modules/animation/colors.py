@@ -1,32 +1,77 @@
+import argparse
+import json
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
 from typing import Final, Self
 import numpy as np
 from numpy.typing import NDArray
-import nfl_data_py as nfl
 import pandas as pd
 
+SNAPSHOT_PATH: Final[Path] = Path(__file__).with_name("team_colors.json")
+
+
 class ColorManager:
     FOOTBALL_COLORS: Final[list[str]] = ["#CBB67C", "#663831"]
 
-    def __init__(self: Self) -> None:
-        """Initialize the ColorManager with NFL team colors from nfl_data_py."""
-        self.teams: pd.DataFrame = nfl.import_team_desc()
-        team_colors_df: pd.DataFrame = self.teams.set_index("team_abbr")[
+    def __init__(self: Self, colors: dict[str, list[str]], version: str) -> None:
+        """Initialize the ColorManager from a team -> colors mapping."""
+        self.version = version
+        self._colors: dict[str, list[str]] = dict(colors)
+
+        # Add football colors
+        self._colors["football"] = self.FOOTBALL_COLORS
+
+        # Precompute primary color distances for every pair of known teams
+        self._team_index: dict[str, int] = {
+            team: i for i, team in enumerate(self._colors)
+        }
+        self._distances = self._calculate_distance_matrix(
+            [team_colors[0] for team_colors in self._colors.values()]
+        )
+
+    @classmethod
+    def from_snapshot(cls: type[Self], path: Path = SNAPSHOT_PATH) -> Self:
+        """Load team colors from a versioned on-disk snapshot."""
+        snapshot = json.loads(path.read_text())
+        return cls(snapshot["colors"], snapshot["version"])
+
+    @classmethod
+    def from_nfl_data(cls: type[Self]) -> Self:
+        """Download team colors from nfl_data_py."""
+        import nfl_data_py as nfl
+
+        teams: pd.DataFrame = nfl.import_team_desc()
+        team_colors_df: pd.DataFrame = teams.set_index("team_abbr")[
             ["team_color", "team_color2", "team_color3", "team_color4"]
         ]
-        
-        # Convert team colors to our format and add football colors
-        self._colors: dict[str, list[str]] = {}
+
+        # Convert team colors to our format
+        colors: dict[str, list[str]] = {}
         for team in team_colors_df.index:
-            colors = [
+            team_colors = [
                 f"#{color}" if isinstance(color, str) and not color.startswith("#") else color
                 for color in team_colors_df.loc[team]
                 if isinstance(color, str) and color.strip()
             ]
-            if colors:  # Only add teams with at least one color
-                self._colors[team] = colors
+            if team_colors:  # Only add teams with at least one color
+                colors[team] = team_colors
 
-        # Add football colors
-        self._colors["football"] = self.FOOTBALL_COLORS
+        return cls(colors, date.today().isoformat())
+
+    def write_snapshot(self: Self, path: Path = SNAPSHOT_PATH) -> None:
+        """Write the team colors to an on-disk snapshot."""
+        colors = {
+            team: team_colors
+            for team, team_colors in self._colors.items()
+            if team != "football"
+        }
+        snapshot = {
+            "version": self.version,
+            "source": "nfl_data_py.import_team_desc",
+            "colors": colors,
+        }
+        path.write_text(json.dumps(snapshot, indent=2) + "\n")
 
     def hex_to_rgb(self: Self, hex_color: str) -> NDArray[np.int_]:
         """Convert hex color to RGB array."""
@@ -38,34 +83,77 @@ class ColorManager:
         """Calculate the perceptual distance between two colors."""
         if hex1 == hex2:
             return 0.0
-        
+
         rgb1 = self.hex_to_rgb(hex1)
         rgb2 = self.hex_to_rgb(hex2)
         rm = 0.5 * (rgb1[0] + rgb2[0])
         weights = np.array([2 + rm, 4, 3 - rm])
-        
+
         squared_distance = np.sum(weights * (rgb1 - rgb2) ** 2)
         # Ensure we don't take sqrt of negative number due to floating point imprecision
         return float(np.sqrt(max(0.0, squared_distance)))
 
+    def _calculate_distance_matrix(self: Self, hex_colors: list[str]) -> NDArray[np.float64]:
+        """Calculate calculate_color_distance for every pair of colors at once."""
+        rgb = np.array([self.hex_to_rgb(color) for color in hex_colors], dtype=np.float64)
+        rgb1, rgb2 = rgb[:, None, :], rgb[None, :, :]
+        rm = 0.5 * (rgb1[..., 0] + rgb2[..., 0])
+        weights = np.stack([2 + rm, np.full_like(rm, 4), 3 - rm], axis=-1)
+
+        squared_distance = np.sum(weights * (rgb1 - rgb2) ** 2, axis=-1)
+        return np.sqrt(np.maximum(0.0, squared_distance))
+
     def get_team_colors(self: Self, team: str) -> list[str]:
         """Get color scheme for a team."""
         return self._colors.get(team, ["#FFFFFF", "#000000"])
 
+    def get_color_distance(self: Self, team1: str, team2: str) -> float:
+        """Get the distance between two teams' primary colors."""
+        i, j = self._team_index.get(team1), self._team_index.get(team2)
+        if i is None or j is None:
+            return self.calculate_color_distance(
+                self.get_team_colors(team1)[0], self.get_team_colors(team2)[0]
+            )
+        return float(self._distances[i, j])
+
     def get_contrasting_pairs(self: Self, team1: str, team2: str) -> dict[str, list[str]]:
         """Get contrasting color pairs for two teams."""
         color_array_1 = self.get_team_colors(team1)
         color_array_2 = self.get_team_colors(team2)
-        
-        if self.calculate_color_distance(color_array_1[0], color_array_2[0]) < 500:
+
+        if self.get_color_distance(team1, team2) < 500:
             return {
                 team1: [color_array_1[0], color_array_1[1]],
                 team2: [color_array_2[1], color_array_2[0]],
                 "football": self._colors["football"],
             }
-        
+
         return {
             team1: [color_array_1[0], color_array_1[1]],
             team2: [color_array_2[0], color_array_2[1]],
             "football": self._colors["football"],
         }
+
+
+# Load the snapshot once per process and share it between animations
+@lru_cache()
+def get_color_manager() -> ColorManager:
+    return ColorManager.from_snapshot()
+
+
+def refresh_snapshot(path: Path = SNAPSHOT_PATH) -> ColorManager:
+    """Download fresh team colors and overwrite the on-disk snapshot."""
+    color_manager = ColorManager.from_nfl_data()
+    color_manager.write_snapshot(path)
+    get_color_manager.cache_clear()
+    return color_manager
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the team color snapshot.")
+    parser.add_argument("command", choices=["refresh"])
+    parser.add_argument("--path", type=Path, default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    color_manager = refresh_snapshot(args.path)
+    print(f"Wrote team colors version {color_manager.version} to {args.path}")
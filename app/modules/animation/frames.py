@@ -0,0 +1,52 @@
+from typing import Final, Self
+import numpy as np
+from numpy.typing import NDArray
+from app.modules.animation.types import PlayTracking
+
+FRAME_COLUMNS: Final[tuple[str, ...]] = ("x", "y", "s", "a", "dir")
+
+
+class FrameIndex:
+    """Per-frame, per-club column slices of a play's dense tracking arrays."""
+
+    __slots__ = ("frame_ids", "clubs", "_tracking", "_club_players", "_frame_pos")
+
+    def __init__(self: Self, tracking: PlayTracking) -> None:
+        """Record which players belong to each club."""
+        self._tracking = tracking
+        self.frame_ids: NDArray[np.int_] = tracking.frame_ids
+
+        # Clubs keep their order of first appearance, as ``Series.unique`` does
+        self.clubs: list[str] = list(dict.fromkeys(tracking.clubs))
+        self._club_players: dict[str, NDArray[np.intp]] = {
+            club: np.flatnonzero(tracking.clubs == club) for club in self.clubs
+        }
+        self._frame_pos: dict[int, int] = {
+            int(frame_id): pos for pos, frame_id in enumerate(self.frame_ids)
+        }
+
+    def get(
+        self: Self, frame_id: int, club: str, keep_missing: bool = False
+    ) -> dict[str, NDArray]:
+        """Return the column slices for one club in one frame.
+
+        With keep_missing, players absent from the frame stay in place as NaN so
+        every frame lists the club's players in the same order.
+        """
+        pos = self._frame_pos.get(int(frame_id))
+        if pos is None:
+            columns = {column: np.empty(0) for column in FRAME_COLUMNS}
+            columns["display_name"] = np.empty(0, dtype=object)
+            return columns
+
+        players = self._club_players[club]
+        if not keep_missing:
+            # Drop players missing from this frame
+            players = players[~np.isnan(self._tracking.x[pos, players])]
+
+        columns = {
+            column: getattr(self._tracking, column)[pos, players]
+            for column in FRAME_COLUMNS
+        }
+        columns["display_name"] = self._tracking.display_names[players]
+        return columns
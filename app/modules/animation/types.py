@@ -1,10 +1,19 @@
-from typing import Literal, Protocol, Self
+from typing import Final, Literal, Protocol, Self
 from dataclasses import dataclass
 from typing import TypeAlias
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
 import plotly.graph_objects as go
 
 PlayDirection = Literal["left", "right"]
-FrameData: TypeAlias = list[go.Scatter]
+Renderer = Literal["svg", "webgl"]
+FrameData: TypeAlias = list[go.Scatter | go.Scattergl]
+
+
+class AnimationConfigError(ValueError):
+    """An invalid AnimationConfig, or one that selects no frames of a play."""
+
 
 @dataclass(frozen=True)
 class PlayInfo:
@@ -25,6 +34,32 @@ class AnimationConfig:
     redraw: bool = True
     marker_size: int = 15
     field_color: str = "#00B140"
+    # Keep field geometry in the base figure and animate only player traces
+    static_field: bool = False
+    # Level of detail: keep every Nth frame, cap the frame count, or trim the
+    # play to [first_frame, last_frame]. frame_duration is scaled by the
+    # effective stride so playback still runs in real time.
+    frame_stride: int = 1
+    max_frames: int | None = None
+    first_frame: int | None = None
+    last_frame: int | None = None
+    # Draw player traces as SVG (go.Scatter) or WebGL (go.Scattergl)
+    renderer: Renderer = "svg"
+    # Ship speed, acceleration and direction as numeric customdata formatted by
+    # a hovertemplate in the browser, with player names sent once
+    client_hover: bool = False
+
+    def __post_init__(self: Self) -> None:
+        if self.frame_stride < 1:
+            raise AnimationConfigError("frame_stride must be at least 1")
+        if self.max_frames is not None and self.max_frames < 1:
+            raise AnimationConfigError("max_frames must be at least 1")
+        if (
+            self.first_frame is not None
+            and self.last_frame is not None
+            and self.first_frame > self.last_frame
+        ):
+            raise AnimationConfigError("first_frame is after last_frame")
 
 @dataclass(frozen=True)
 class FrameInfo:
@@ -33,6 +68,8 @@ class FrameInfo:
     name: str
 
 class ColorProvider(Protocol):
+    version: str
+
     def get_contrasting_pairs(self: Self, team1: str, team2: str) -> dict[str, list[str]]: ...
 
 @dataclass(frozen=True)
@@ -43,3 +80,128 @@ class PlayerData:
     acceleration: float
     direction: float
     display_name: str
+
+
+class PlayTracking:
+    """Tracking data for one play as dense (frames x players) arrays.
+
+    Players are ordered by first appearance in the source rows. A player
+    missing from a frame has NaN in every kinematic array for that frame.
+    """
+
+    KINEMATICS: Final[tuple[str, ...]] = ("x", "y", "s", "a", "dir", "dis")
+
+    __slots__ = (
+        "game_id",
+        "play_id",
+        "play_direction",
+        "frame_ids",
+        "nfl_ids",
+        "clubs",
+        "display_names",
+        "x",
+        "y",
+        "s",
+        "a",
+        "dir",
+        "dis",
+    )
+
+    def __init__(
+        self: Self,
+        game_id: int,
+        play_id: int,
+        play_direction: PlayDirection,
+        frame_ids: NDArray[np.int_],
+        nfl_ids: NDArray[np.int_],
+        clubs: NDArray[np.object_],
+        display_names: NDArray[np.object_],
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        s: NDArray[np.float64],
+        a: NDArray[np.float64],
+        dir: NDArray[np.float64],
+        dis: NDArray[np.float64],
+    ) -> None:
+        self.game_id = game_id
+        self.play_id = play_id
+        self.play_direction = play_direction
+        self.frame_ids = frame_ids
+        self.nfl_ids = nfl_ids
+        self.clubs = clubs
+        self.display_names = display_names
+        self.x = x
+        self.y = y
+        self.s = s
+        self.a = a
+        self.dir = dir
+        self.dis = dis
+
+    @classmethod
+    def from_dataframe(cls: type[Self], tracking_df: pd.DataFrame) -> Self:
+        """Pack long-format tracking rows (TrackingData field names).
+
+        Raises ValueError on rows without an nfl_id, or with the same frame
+        and player.
+        """
+        frame_ids, frame_pos = np.unique(
+            tracking_df["frame_id"].to_numpy(), return_inverse=True
+        )
+        player_pos, nfl_ids = pd.factorize(tracking_df["nfl_id"])
+        # factorize numbers a missing id -1, which would index the last player
+        if (player_pos < 0).any():
+            raise ValueError("Tracking rows without an nfl_id")
+        _, first_rows = np.unique(player_pos, return_index=True)
+
+        shape = (len(frame_ids), len(nfl_ids))
+        seen = np.zeros(shape, dtype=bool)
+        seen[frame_pos, player_pos] = True
+        if np.count_nonzero(seen) < len(tracking_df):
+            raise ValueError("More than one tracking row for a frame and player")
+
+        kinematics = {}
+        for column in cls.KINEMATICS:
+            values = np.full(shape, np.nan)
+            values[frame_pos, player_pos] = tracking_df[column].to_numpy()
+            kinematics[column] = values
+
+        first = tracking_df.iloc[0] if len(tracking_df) else {}
+        return cls(
+            game_id=first.get("game_id"),
+            play_id=first.get("play_id"),
+            play_direction=first.get("play_direction"),
+            frame_ids=frame_ids,
+            nfl_ids=np.asarray(nfl_ids),
+            clubs=tracking_df["club"].to_numpy()[first_rows],
+            display_names=tracking_df["display_name"].to_numpy()[first_rows],
+            **kinematics,
+        )
+
+    def to_dataframe(self: Self) -> pd.DataFrame:
+        """Unpack to long-format rows, ordered by frame and then player."""
+        frame_pos, player_pos = np.nonzero(~np.isnan(self.x))
+        return pd.DataFrame({
+            "game_id": self.game_id,
+            "play_id": self.play_id,
+            "nfl_id": self.nfl_ids[player_pos],
+            "play_direction": self.play_direction,
+            "club": self.clubs[player_pos],
+            "frame_id": self.frame_ids[frame_pos],
+            **{
+                column: getattr(self, column)[frame_pos, player_pos]
+                for column in ("s", "a", "dir", "dis")
+            },
+            "display_name": self.display_names[player_pos],
+            "x": self.x[frame_pos, player_pos],
+            "y": self.y[frame_pos, player_pos],
+        })
+
+    @property
+    def nbytes(self: Self) -> int:
+        """Approximate memory held by the arrays."""
+        arrays = ("frame_ids", "nfl_ids", "clubs", "display_names", *self.KINEMATICS)
+        strings = sum(len(name) for name in self.display_names)
+        return strings + sum(getattr(self, name).nbytes for name in arrays)
+
+    def __len__(self: Self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.x)))
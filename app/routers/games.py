@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from app.schemas.game import GameResponse
 from app.services import crud
-from app.dependencies import get_db
+from app.services.backends import DataBackend
+from app.dependencies import get_backend
+from app.utils.etag import etag_json_response
+from app.utils.metrics import timed
 
 router = APIRouter()
 
 
 @router.get("/games/{week}", response_model=GameResponse)
-def read_games_by_week(week: int, db: Session = Depends(get_db)) -> GameResponse:
+async def read_games_by_week(
+    request: Request, week: int, backend: DataBackend = Depends(get_backend)
+) -> Response:
     try:
-        return {"games": crud.get_games_by_week(db, week)}
+        games = await crud.get_games_by_week(backend, week)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    with timed("validation"):
+        response = GameResponse(games=games)
+    return etag_json_response(request, response)
@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from app.utils.metrics import PROMETHEUS_MEDIA_TYPE, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response, include_in_schema=False)
+async def read_metrics() -> Response:
+    return Response(content=REGISTRY.render(), media_type=PROMETHEUS_MEDIA_TYPE)
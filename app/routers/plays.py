@@ -1,27 +1,164 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.config import get_settings
+from app.modules.animation import AnimationConfig, AnimationConfigError
+from app.schemas.batch import PlayBatchRequest
 from app.schemas.play_response import PlayResponse, PlaySummaryResponse
 from app.services import crud
-from app.dependencies import get_db
+from app.services.backends import DataBackend
+from app.services.figures import get_play_figure, get_play_figure_stream
+from app.services.serialization import (
+    ARROW_STREAM_MEDIA_TYPE,
+    COMPACT_MEDIA_TYPE,
+    play_frames_to_arrow,
+    play_frames_to_json,
+    play_tracking_to_compact,
+)
+from app.dependencies import get_backend
+from app.utils.compression import compress, negotiate_encoding
+from app.utils.etag import etag_json_response
+from app.utils.metrics import timed
 
 router = APIRouter()
 
 
 @router.get("/plays/{game_id}", response_model=PlaySummaryResponse)
-def read_plays_by_game(
-    game_id: int, db: Session = Depends(get_db)
-) -> PlaySummaryResponse:
+async def read_plays_by_game(
+    request: Request, game_id: int, backend: DataBackend = Depends(get_backend)
+) -> Response:
     try:
-        return {"plays": crud.get_plays_by_game(db, game_id)}
+        plays = await crud.get_plays_by_game(backend, game_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    # Users step through a game's plays next, so have them in memory by then
+    crud.prefetch_game(backend, game_id)
+    with timed("validation"):
+        response = PlaySummaryResponse(plays=plays)
+    return etag_json_response(request, response)
 
 
-@router.get("/play/{game_id}/{play_id}", response_model=PlayResponse)
-def read_play_data(
-    game_id: int, play_id: int, db: Session = Depends(get_db)
-) -> PlayResponse:
+@router.post(
+    "/plays/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def read_play_batch(
+    batch: PlayBatchRequest, backend: DataBackend = Depends(get_backend)
+) -> StreamingResponse:
     try:
-        return crud.get_play_data(db, game_id, play_id)
+        plays = [(play.game_id, play.play_id) for play in batch.plays]
+        keys = await crud.get_batch_play_keys(backend, plays, batch.game_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    async def fast_ndjson_lines() -> AsyncIterator[bytes]:
+        async for _, *frames in crud.iter_play_frames(backend, keys):
+            yield play_frames_to_json(*frames) + b"\n"
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        # One PlayResponse per line, serialized the same way as /play
+        async for play in crud.iter_play_data(backend, keys):
+            with timed("validation"):
+                response = PlayResponse.model_validate(play)
+            with timed("serialization"):
+                line = response.model_dump_json(by_alias=True) + "\n"
+            yield line
+
+    lines = fast_ndjson_lines() if get_settings().fast_json else ndjson_lines()
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get(
+    "/play/{game_id}/{play_id}",
+    response_model=PlayResponse,
+    responses={
+        200: {"content": {ARROW_STREAM_MEDIA_TYPE: {}, COMPACT_MEDIA_TYPE: {}}}
+    },
+)
+async def read_play_data(
+    game_id: int,
+    play_id: int,
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    backend: DataBackend = Depends(get_backend),
+) -> PlayResponse | Response:
+    try:
+        if accept and COMPACT_MEDIA_TYPE in accept:
+            frames = await crud.get_play_tracking(backend, game_id, play_id)
+            encoding = negotiate_encoding(accept_encoding)
+            with timed("serialization"):
+                content = compress(play_tracking_to_compact(*frames), encoding)
+            headers = {"Vary": "Accept, Accept-Encoding"}
+            if encoding:
+                headers["Content-Encoding"] = encoding
+            return Response(
+                content=content, media_type=COMPACT_MEDIA_TYPE, headers=headers
+            )
+
+        if accept and ARROW_STREAM_MEDIA_TYPE in accept:
+            frames = await crud.get_play_frames(backend, game_id, play_id)
+            with timed("serialization"):
+                content = play_frames_to_arrow(*frames)
+            return Response(content=content, media_type=ARROW_STREAM_MEDIA_TYPE)
+
+        if get_settings().fast_json:
+            frames = await crud.get_play_frames(backend, game_id, play_id)
+            content = play_frames_to_json(*frames)
+            return Response(content=content, media_type="application/json")
+
+        play = await crud.get_play_data(backend, game_id, play_id)
+        # Validate and serialize here rather than in FastAPI, so both are timed
+        with timed("validation"):
+            response = PlayResponse.model_validate(play)
+        with timed("serialization"):
+            content = response.model_dump_json(by_alias=True)
+        return Response(content=content, media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/play/{game_id}/{play_id}/figure",
+    response_class=Response,
+    responses={200: {"content": {"application/json": {}}}},
+)
+async def read_play_figure(
+    game_id: int,
+    play_id: int,
+    config: AnimationConfig = Depends(),
+    backend: DataBackend = Depends(get_backend),
+) -> Response:
+    try:
+        return Response(
+            content=await get_play_figure(backend, game_id, play_id, config),
+            media_type="application/json",
+        )
+    except AnimationConfigError:
+        # Answered with a 422 by the app's handler
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/play/{game_id}/{play_id}/figure/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_play_figure(
+    game_id: int,
+    play_id: int,
+    config: AnimationConfig = Depends(),
+    batch_size: int = Query(default=10, ge=1),
+    backend: DataBackend = Depends(get_backend),
+) -> StreamingResponse:
+    try:
+        lines = await get_play_figure_stream(
+            backend, game_id, play_id, config, batch_size
+        )
+    except AnimationConfigError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from app.schemas.week import WeekResponse
 from app.services import crud
-from app.dependencies import get_db
+from app.services.backends import DataBackend
+from app.dependencies import get_backend
+from app.utils.etag import etag_json_response
+from app.utils.metrics import timed
 
 router = APIRouter()
 
 
 @router.get("/weeks", response_model=WeekResponse)
-def read_weeks(db: Session = Depends(get_db)) -> WeekResponse:
+async def read_weeks(
+    request: Request, backend: DataBackend = Depends(get_backend)
+) -> Response:
     try:
-        return {"weeks": crud.get_weeks(db)}
+        weeks = await crud.get_weeks(backend)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    with timed("validation"):
+        response = WeekResponse(weeks=weeks)
+    return etag_json_response(request, response)
@@ -0,0 +1,18 @@
+from typing import Self
+from pydantic import BaseModel, model_validator
+
+
+class PlayKey(BaseModel):
+    game_id: int
+    play_id: int
+
+
+class PlayBatchRequest(BaseModel):
+    plays: list[PlayKey] = []
+    game_id: int | None = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self: Self) -> Self:
+        if not self.plays and self.game_id is None:
+            raise ValueError("Request at least one play or a game_id")
+        return self
@@ -1,5 +1,10 @@
+from typing import TYPE_CHECKING, Self
+import pandas as pd
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from app.modules.animation.types import PlayTracking
+
 
 class TrackingData(BaseModel):
     game_id: int = Field(alias="gameid")
@@ -19,3 +24,18 @@ class TrackingData(BaseModel):
     class Config:
         from_attributes = True
         populate_by_name = True
+
+    # PlayTracking is imported on use, so the schemas don't load the animation
+    # package and plotly with it
+    @classmethod
+    def from_play_tracking(cls: type[Self], tracking: "PlayTracking") -> list[Self]:
+        rows = tracking.to_dataframe().to_dict(orient="records")
+        return [cls.model_validate(row) for row in rows]
+
+    @staticmethod
+    def to_play_tracking(rows: list["TrackingData"]) -> "PlayTracking":
+        from app.modules.animation.types import PlayTracking
+
+        return PlayTracking.from_dataframe(
+            pd.DataFrame([row.model_dump() for row in rows])
+        )
@@ -0,0 +1,28 @@
+import importlib
+from typing import TYPE_CHECKING
+from app.services.backends.base import DataBackend
+
+if TYPE_CHECKING:
+    from app.services.backends.parquet import ParquetBackend
+    from app.services.backends.sql import AsyncSqlBackend, SqlBackend
+
+# Backends import SQLAlchemy or pyarrow.dataset, so each loads on first use
+_BACKEND_MODULES = {
+    "AsyncSqlBackend": "app.services.backends.sql",
+    "ParquetBackend": "app.services.backends.parquet",
+    "SqlBackend": "app.services.backends.sql",
+}
+
+
+def __getattr__(name: str) -> type:
+    if name in _BACKEND_MODULES:
+        return getattr(importlib.import_module(_BACKEND_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "AsyncSqlBackend",
+    "DataBackend",
+    "ParquetBackend",
+    "SqlBackend",
+]
@@ -0,0 +1,93 @@
+import asyncio
+from collections.abc import AsyncIterator, Generator
+from typing import Final, Protocol, Self
+import pandas as pd
+
+# Columns each backend returns, named as they are stored in the database
+GAME_COLUMNS: Final[list[str]] = ["gameid", "hometeamabbr", "visitorteamabbr"]
+PLAY_SUMMARY_COLUMNS: Final[list[str]] = [
+    "playid",
+    "playdescription",
+    "quarter",
+    "gameclock",
+]
+PLAY_COLUMNS: Final[list[str]] = [
+    "gameid",
+    "playid",
+    "playdescription",
+    "down",
+    "quarter",
+    "absoluteyardlinenumber",
+    "yardstogo",
+]
+TRACKING_COLUMNS: Final[list[str]] = [
+    "gameid",
+    "playid",
+    "nflid",
+    "playdirection",
+    "club",
+    "frameid",
+    "s",
+    "a",
+    "dir",
+    "dis",
+    "displayname",
+    "x",
+    "y",
+]
+
+
+async def iterate_in_thread(
+    chunks: Generator[pd.DataFrame, None, None],
+) -> AsyncIterator[pd.DataFrame]:
+    """Advance a blocking generator on worker threads, one chunk at a time."""
+    try:
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Release the cursor or scan even if the consumer stops early
+        await asyncio.to_thread(chunks.close)
+
+
+class DataBackend(Protocol):
+    """Source of the games, plays and tracking tables behind the crud layer."""
+
+    async def read_weeks(self: Self) -> pd.DataFrame:
+        """Distinct weeks, ordered by week."""
+        ...
+
+    async def read_games(self: Self, week: int) -> pd.DataFrame:
+        """GAME_COLUMNS for a week's games, ordered by game id."""
+        ...
+
+    async def read_plays(self: Self, game_id: int) -> pd.DataFrame:
+        """PLAY_SUMMARY_COLUMNS for a game, ordered by quarter and game clock."""
+        ...
+
+    async def read_play(
+        self: Self, game_id: int, play_id: int
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """GAME_COLUMNS, PLAY_COLUMNS and TRACKING_COLUMNS rows for one play."""
+        ...
+
+    async def read_play_batch(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Rows for many (game id, play id) pairs, one set-based read per table."""
+        ...
+
+    async def read_play_metadata(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """GAME_COLUMNS and PLAY_COLUMNS rows for many (game id, play id) pairs."""
+        ...
+
+    def stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> AsyncIterator[pd.DataFrame]:
+        """TRACKING_COLUMNS rows for many plays, at most chunk_rows at a time.
+
+        Each play's rows are adjacent, and plays follow the order of keys where
+        the store allows it.
+        """
+        ...
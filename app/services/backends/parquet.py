@@ -0,0 +1,190 @@
+import asyncio
+from collections.abc import AsyncIterator, Generator
+from functools import cached_property
+from pathlib import Path
+from typing import Self
+import pandas as pd
+import pyarrow.dataset as ds
+from app.services.backends.base import (
+    GAME_COLUMNS,
+    PLAY_COLUMNS,
+    PLAY_SUMMARY_COLUMNS,
+    TRACKING_COLUMNS,
+    iterate_in_thread,
+)
+
+
+class ParquetBackend:
+    """Reads the Big Data Bowl tables from a local Parquet store.
+
+    The store is laid out as::
+
+        root/games.parquet
+        root/plays.parquet
+        root/tracking/week=<week>/gameid=<game id>/*.parquet
+
+    Tracking lookups prune partitions by week and game and push the play
+    filter and column projection down to the Parquet reader. Reads run on
+    worker threads so they don't block the event loop.
+    """
+
+    def __init__(self: Self, root: Path) -> None:
+        self.root = root
+
+    @cached_property
+    def games(self: Self) -> ds.Dataset:
+        return ds.dataset(self.root / "games.parquet", format="parquet")
+
+    @cached_property
+    def plays(self: Self) -> ds.Dataset:
+        return ds.dataset(self.root / "plays.parquet", format="parquet")
+
+    @cached_property
+    def tracking(self: Self) -> ds.Dataset:
+        return ds.dataset(
+            self.root / "tracking", format="parquet", partitioning="hive"
+        )
+
+    def _read_weeks(self: Self) -> pd.DataFrame:
+        weeks = self.games.to_table(columns=["week"]).to_pandas()
+        return weeks.drop_duplicates().sort_values("week", ignore_index=True)
+
+    def _read_games(self: Self, week: int) -> pd.DataFrame:
+        games = self.games.to_table(
+            columns=GAME_COLUMNS, filter=ds.field("week") == week
+        ).to_pandas()
+        return games.sort_values("gameid", ignore_index=True)
+
+    def _read_plays(self: Self, game_id: int) -> pd.DataFrame:
+        plays = self.plays.to_table(
+            columns=PLAY_SUMMARY_COLUMNS, filter=ds.field("gameid") == game_id
+        ).to_pandas()
+        return plays.sort_values(
+            ["quarter", "gameclock"], ascending=[True, False], ignore_index=True
+        )
+
+    def _read_play(
+        self: Self, game_id: int, play_id: int
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        game_filter = ds.field("gameid") == game_id
+        game_data = self.games.to_table(
+            columns=[*GAME_COLUMNS, "week"], filter=game_filter
+        ).to_pandas()
+        play_data = self.plays.to_table(
+            columns=PLAY_COLUMNS, filter=game_filter & (ds.field("playid") == play_id)
+        ).to_pandas()
+
+        tracking_filter = game_filter & (ds.field("playid") == play_id)
+        if not game_data.empty:
+            tracking_filter &= ds.field("week") == int(game_data["week"].iloc[0])
+        tracking_data = self.tracking.to_table(
+            columns=TRACKING_COLUMNS, filter=tracking_filter
+        ).to_pandas()
+
+        return game_data[GAME_COLUMNS], play_data, tracking_data
+
+    def _read_play_batch(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        game_ids = sorted({game_id for game_id, _ in keys})
+        play_ids = sorted({play_id for _, play_id in keys})
+        game_filter = ds.field("gameid").isin(game_ids)
+        game_data = self.games.to_table(
+            columns=[*GAME_COLUMNS, "week"], filter=game_filter
+        ).to_pandas()
+
+        # Prune by the game and play id sets, then keep only the requested pairs
+        play_filter = game_filter & ds.field("playid").isin(play_ids)
+        play_data = self.plays.to_table(
+            columns=PLAY_COLUMNS, filter=play_filter
+        ).to_pandas()
+        tracking_filter = play_filter & ds.field("week").isin(
+            game_data["week"].unique().tolist()
+        )
+        tracking_data = self.tracking.to_table(
+            columns=TRACKING_COLUMNS, filter=tracking_filter
+        ).to_pandas()
+
+        requested = pd.MultiIndex.from_tuples(keys)
+        play_data = play_data[
+            pd.MultiIndex.from_frame(play_data[["gameid", "playid"]]).isin(requested)
+        ]
+        tracking_data = tracking_data[
+            pd.MultiIndex.from_frame(tracking_data[["gameid", "playid"]]).isin(
+                requested
+            )
+        ]
+        return game_data[GAME_COLUMNS], play_data, tracking_data
+
+    def _read_play_metadata(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        game_ids = sorted({game_id for game_id, _ in keys})
+        play_ids = sorted({play_id for _, play_id in keys})
+        game_filter = ds.field("gameid").isin(game_ids)
+        game_data = self.games.to_table(
+            columns=GAME_COLUMNS, filter=game_filter
+        ).to_pandas()
+        play_data = self.plays.to_table(
+            columns=PLAY_COLUMNS, filter=game_filter & ds.field("playid").isin(play_ids)
+        ).to_pandas()
+
+        requested = pd.MultiIndex.from_tuples(keys)
+        play_data = play_data[
+            pd.MultiIndex.from_frame(play_data[["gameid", "playid"]]).isin(requested)
+        ]
+        return game_data, play_data
+
+    def _stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> Generator[pd.DataFrame, None, None]:
+        game_plays: dict[int, list[int]] = {}
+        for game_id, play_id in keys:
+            game_plays.setdefault(game_id, []).append(play_id)
+        games = self.games.to_table(
+            columns=["gameid", "week"],
+            filter=ds.field("gameid").isin(list(game_plays)),
+        ).to_pandas()
+        weeks = dict(zip(games["gameid"], games["week"]))
+
+        # Games are scanned in request order, each pruned to its own partition.
+        # Within a game, plays come in the order they were ingested.
+        for game_id, play_ids in game_plays.items():
+            play_filter = ds.field("playid").isin(play_ids)
+            tracking_filter = (ds.field("gameid") == game_id) & play_filter
+            if game_id in weeks:
+                tracking_filter &= ds.field("week") == int(weeks[game_id])
+            for batch in self.tracking.to_batches(
+                columns=TRACKING_COLUMNS, filter=tracking_filter, batch_size=chunk_rows
+            ):
+                if batch.num_rows:
+                    yield batch.to_pandas()
+
+    async def read_weeks(self: Self) -> pd.DataFrame:
+        return await asyncio.to_thread(self._read_weeks)
+
+    async def read_games(self: Self, week: int) -> pd.DataFrame:
+        return await asyncio.to_thread(self._read_games, week)
+
+    async def read_plays(self: Self, game_id: int) -> pd.DataFrame:
+        return await asyncio.to_thread(self._read_plays, game_id)
+
+    async def read_play(
+        self: Self, game_id: int, play_id: int
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        return await asyncio.to_thread(self._read_play, game_id, play_id)
+
+    async def read_play_batch(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        return await asyncio.to_thread(self._read_play_batch, keys)
+
+    async def read_play_metadata(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        return await asyncio.to_thread(self._read_play_metadata, keys)
+
+    def stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> AsyncIterator[pd.DataFrame]:
+        return iterate_in_thread(self._stream_tracking(keys, chunk_rows))
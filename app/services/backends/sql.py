@@ -0,0 +1,165 @@
+import asyncio
+from collections.abc import AsyncIterator, Generator
+from typing import TYPE_CHECKING, Final, Self
+import pandas as pd
+from sqlalchemy import Engine, TextClause, bindparam, text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+from app.services.backends.base import (
+    GAME_COLUMNS,
+    PLAY_COLUMNS,
+    TRACKING_COLUMNS,
+    iterate_in_thread,
+)
+
+WEEKS_QUERY: Final[TextClause] = text("SELECT DISTINCT week FROM games ORDER BY week")
+GAMES_QUERY: Final[TextClause] = text(
+    "SELECT gameId, homeTeamAbbr, visitorTeamAbbr FROM games WHERE week = :week ORDER BY gameId"
+)
+PLAYS_QUERY: Final[TextClause] = text(
+    "SELECT playId, playDescription, quarter, gameClock FROM plays WHERE gameId = :game_id ORDER BY quarter, gameClock DESC"
+)
+GAME_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(GAME_COLUMNS)} FROM games WHERE gameId = :game_id"
+)
+PLAY_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(PLAY_COLUMNS)} FROM plays WHERE gameId = :game_id AND playId = :play_id"
+)
+TRACKING_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(TRACKING_COLUMNS)} FROM tracking_data WHERE gameId = :game_id AND playId = :play_id"
+)
+
+GAME_BATCH_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(GAME_COLUMNS)} FROM games WHERE gameId IN :game_ids"
+).bindparams(bindparam("game_ids", expanding=True))
+PLAY_BATCH_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(PLAY_COLUMNS)} FROM plays WHERE (gameId, playId) IN :keys"
+).bindparams(bindparam("keys", expanding=True))
+TRACKING_BATCH_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(TRACKING_COLUMNS)} FROM tracking_data WHERE (gameId, playId) IN :keys"
+).bindparams(bindparam("keys", expanding=True))
+# Joining on the numbered keys returns plays in the order they were requested
+TRACKING_STREAM_QUERY: Final[TextClause] = text(
+    f"SELECT {','.join(f't.{column}' for column in TRACKING_COLUMNS)} FROM tracking_data t"
+    " JOIN unnest(CAST(:game_ids AS integer[]), CAST(:play_ids AS integer[]))"
+    " WITH ORDINALITY AS k(gameid, playid, position)"
+    " ON t.gameid = k.gameid AND t.playid = k.playid ORDER BY k.position"
+)
+
+
+def _stream_params(keys: list[tuple[int, int]]) -> dict:
+    return {
+        "game_ids": [game_id for game_id, _ in keys],
+        "play_ids": [play_id for _, play_id in keys],
+    }
+
+
+class SqlBackend:
+    """Reads the Big Data Bowl tables from Postgres.
+
+    Each query checks out its own pooled connection on a worker thread, so
+    independent queries for one request run concurrently.
+    """
+
+    def __init__(self: Self, engine: Engine) -> None:
+        self.engine = engine
+
+    def _read_sql(self: Self, query: TextClause, params: dict) -> pd.DataFrame:
+        with self.engine.connect() as connection:
+            return pd.read_sql(query, connection, params=params)
+
+    async def _query(
+        self: Self, query: TextClause, **params: object
+    ) -> pd.DataFrame:
+        return await asyncio.to_thread(self._read_sql, query, params)
+
+    async def read_weeks(self: Self) -> pd.DataFrame:
+        return await self._query(WEEKS_QUERY)
+
+    async def read_games(self: Self, week: int) -> pd.DataFrame:
+        return await self._query(GAMES_QUERY, week=week)
+
+    async def read_plays(self: Self, game_id: int) -> pd.DataFrame:
+        return await self._query(PLAYS_QUERY, game_id=game_id)
+
+    async def read_play(
+        self: Self, game_id: int, play_id: int
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        game_data, play_data, tracking_data = await asyncio.gather(
+            self._query(GAME_QUERY, game_id=game_id),
+            self._query(PLAY_QUERY, game_id=game_id, play_id=play_id),
+            self._query(TRACKING_QUERY, game_id=game_id, play_id=play_id),
+        )
+        return game_data, play_data, tracking_data
+
+    async def read_play_batch(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        game_ids = sorted({game_id for game_id, _ in keys})
+        game_data, play_data, tracking_data = await asyncio.gather(
+            self._query(GAME_BATCH_QUERY, game_ids=game_ids),
+            self._query(PLAY_BATCH_QUERY, keys=keys),
+            self._query(TRACKING_BATCH_QUERY, keys=keys),
+        )
+        return game_data, play_data, tracking_data
+
+    async def read_play_metadata(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        game_ids = sorted({game_id for game_id, _ in keys})
+        game_data, play_data = await asyncio.gather(
+            self._query(GAME_BATCH_QUERY, game_ids=game_ids),
+            self._query(PLAY_BATCH_QUERY, keys=keys),
+        )
+        return game_data, play_data
+
+    def _stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> Generator[pd.DataFrame, None, None]:
+        with self.engine.connect() as connection:
+            # A server-side cursor, so only chunk_rows rows are held at a time
+            connection.execution_options(yield_per=chunk_rows)
+            yield from pd.read_sql(
+                TRACKING_STREAM_QUERY,
+                connection,
+                params=_stream_params(keys),
+                chunksize=chunk_rows,
+            )
+
+    def stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> AsyncIterator[pd.DataFrame]:
+        return iterate_in_thread(self._stream_tracking(keys, chunk_rows))
+
+
+class AsyncSqlBackend(SqlBackend):
+    """Reads the Big Data Bowl tables from Postgres through an asyncio driver."""
+
+    def __init__(self: Self, engine: "AsyncEngine") -> None:
+        self.engine = engine
+
+    async def _query(
+        self: Self, query: TextClause, **params: object
+    ) -> pd.DataFrame:
+        async with self.engine.connect() as connection:
+            return await connection.run_sync(
+                lambda sync_connection: pd.read_sql(
+                    query, sync_connection, params=params
+                )
+            )
+
+    async def stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> AsyncIterator[pd.DataFrame]:
+        async with self.engine.connect() as connection:
+            # stream() fetches through a server-side cursor
+            result = await connection.stream(
+                TRACKING_STREAM_QUERY.execution_options(yield_per=chunk_rows),
+                _stream_params(keys),
+            )
+            columns = list(result.keys())
+            async for rows in result.partitions(chunk_rows):
+                yield pd.DataFrame.from_records(
+                    rows, columns=columns, coerce_float=True
+                )
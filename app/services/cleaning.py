@@ -0,0 +1,57 @@
+from typing import Final
+import numpy as np
+import pandas as pd
+
+# Narrowest types that hold the tracking columns. Floats stay float64 so values
+# read back exactly as they appear in the CSVs.
+TRACKING_DTYPES: Final[dict[str, str]] = {
+    "gameid": "int32",
+    "playid": "int32",
+    "nflid": "int32",
+    "frameid": "int16",
+    "s": "float64",
+    "a": "float64",
+    "dir": "float64",
+    "dis": "float64",
+    "x": "float64",
+    "y": "float64",
+}
+
+
+def clean_tracking_data(tracking_data: pd.DataFrame) -> pd.DataFrame:
+    """Fill the gaps the animation can't handle and narrow the column types.
+
+    Run once at ingestion, so the stores hold clean rows and requests don't
+    repeat the work.
+    """
+    # Handle NaN and infinity values for 'dir' column
+    tracking_data["dir"] = (
+        tracking_data["dir"].replace([np.inf, -np.inf], np.nan).fillna(0)
+    )
+
+    # Handle null values for 'nflid' column
+    tracking_data["nflid"] = tracking_data["nflid"].fillna(0)
+
+    return tracking_data.astype(
+        {
+            column: dtype
+            for column, dtype in TRACKING_DTYPES.items()
+            if column in tracking_data
+        }
+    )
+
+
+def check_tracking_data(tracking_data: pd.DataFrame) -> None:
+    """Raise ValueError on rows that were stored without clean_tracking_data.
+
+    A cheap read-time check, so uncleaned rows fail loudly rather than
+    rendering with a missing player id or direction.
+    """
+    if len(tracking_data) and (
+        tracking_data["nflid"].isna().any()
+        or not np.isfinite(tracking_data["dir"].to_numpy(dtype="float64")).all()
+    ):
+        raise ValueError(
+            "Tracking rows were stored without cleaning; reload them with "
+            "app.cli.ingest"
+        )
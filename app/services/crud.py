@@ -1,70 +1,271 @@
+import asyncio
+from collections.abc import AsyncIterator
+from functools import lru_cache
 import pandas as pd
-from sqlalchemy.orm import Session
 import numpy as np
+from app.config import get_settings
+from app.modules.animation.types import PlayTracking
+from app.schemas.tracking import TrackingData
+from app.services.backends import DataBackend
+from app.services.backends.base import TRACKING_COLUMNS
+from app.services.cleaning import check_tracking_data
+from app.services.serialization import to_field_names
+from app.utils.cache import TTLCache, ttl_cache
+from app.utils.metrics import timed
 
+# Weeks, games and plays never change once a game is ingested
+METADATA_CACHE_SIZE = 1024
+METADATA_CACHE_TTL = 3600.0
 
-def get_weeks(db: Session) -> list:
-    # Use the connection from the session
-    with db.connection() as connection:
-        return pd.read_sql("SELECT DISTINCT week FROM games ORDER BY week", connection)[
-            "week"
-        ].tolist()
+# Plays fetched per set-based query when streaming a batch
+BATCH_CHUNK_SIZE = 50
 
 
-def get_games_by_week(db: Session, week: int) -> list[dict]:
-    with db.connection() as connection:
-        return pd.read_sql(
-            "SELECT gameId, homeTeamAbbr, visitorTeamAbbr FROM games WHERE week = %s ORDER BY gameId",
-            connection,
-            params=(week,),
-        ).to_dict(orient="records")
+@ttl_cache(maxsize=METADATA_CACHE_SIZE, ttl=METADATA_CACHE_TTL)
+async def get_weeks(backend: DataBackend) -> list:
+    with timed("db_query"):
+        weeks = await backend.read_weeks()
+    return weeks["week"].tolist()
 
 
-def get_plays_by_game(db: Session, game_id: int) -> list[dict]:
-    with db.connection() as connection:
-        return pd.read_sql(
-            "SELECT playId, playDescription, quarter, gameClock FROM plays WHERE gameId = %s ORDER BY quarter, gameClock DESC",
-            connection,
-            params=(game_id,),
-        ).to_dict(orient="records")
+@ttl_cache(maxsize=METADATA_CACHE_SIZE, ttl=METADATA_CACHE_TTL)
+async def get_games_by_week(backend: DataBackend, week: int) -> list[dict]:
+    with timed("db_query"):
+        games = await backend.read_games(week)
+    return games.to_dict(orient="records")
 
 
-def get_play_data(db: Session, game_id: int, play_id: int) -> dict:
-    gameattrs = "gameid,hometeamabbr,visitorteamabbr"
-    playattrs = (
-        "gameid,playid,playdescription,down,quarter,absoluteyardlinenumber,yardstogo"
+@ttl_cache(maxsize=METADATA_CACHE_SIZE, ttl=METADATA_CACHE_TTL)
+async def get_plays_by_game(backend: DataBackend, game_id: int) -> list[dict]:
+    with timed("db_query"):
+        plays = await backend.read_plays(game_id)
+    return plays.to_dict(orient="records")
+
+
+def _group_rows(df: pd.DataFrame, positions: np.ndarray | None) -> pd.DataFrame:
+    if positions is None:
+        return df.iloc[:0]
+    return df.iloc[positions]
+
+
+PlayFrames = tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
+KeyedPlayFrames = tuple[tuple[int, int], pd.DataFrame, pd.DataFrame, pd.DataFrame]
+
+# Game loads still running, so each game is read at most once at a time
+_game_loads: dict[tuple[DataBackend, int], asyncio.Task] = {}
+
+
+@lru_cache()
+def get_game_cache() -> TTLCache[dict[int, PlayFrames]]:
+    return TTLCache(get_settings().game_cache_entries, METADATA_CACHE_TTL)
+
+
+async def load_game(backend: DataBackend, game_id: int) -> dict[int, PlayFrames]:
+    """Read a whole game at once and split it into get_play_frames results."""
+    plays = await get_plays_by_game(backend, game_id)
+    keys = [(game_id, play["playid"]) for play in plays]
+    with timed("db_query"):
+        game_data, play_data, tracking_data = await backend.read_play_batch(keys)
+    check_tracking_data(tracking_data)
+
+    with timed("dataframe"):
+        play_rows = play_data.groupby("playid").indices
+        tracking_rows = tracking_data.groupby("playid").indices
+        return {
+            play_id: (
+                game_data,
+                _group_rows(play_data, play_rows.get(play_id)),
+                _group_rows(tracking_data, tracking_rows.get(play_id)),
+            )
+            for _, play_id in keys
+        }
+
+
+def prefetch_game(backend: DataBackend, game_id: int) -> None:
+    """Start loading a game into the game cache in the background."""
+    key = (backend, game_id)
+    cache = get_game_cache()
+    if cache.maxsize <= 0 or key in _game_loads or cache.get(key) is not None:
+        return
+
+    async def load() -> None:
+        try:
+            cache.set(key, await load_game(backend, game_id))
+        finally:
+            del _game_loads[key]
+
+    task = asyncio.create_task(load())
+    # Requests fall back to per-play reads, so a failed prefetch is not an error
+    task.add_done_callback(lambda task: task.cancelled() or task.exception())
+    _game_loads[key] = task
+
+
+async def get_play_frames(
+    backend: DataBackend, game_id: int, play_id: int
+) -> PlayFrames:
+    # Frames may be shared with the game cache, so callers must not modify them
+    game = get_game_cache().get((backend, game_id))
+    if game is not None and play_id in game:
+        return game[play_id]
+
+    # Tracking rows are cleaned once at ingestion (app.cli.ingest)
+    with timed("db_query"):
+        frames = await backend.read_play(game_id, play_id)
+    check_tracking_data(frames[2])
+    return frames
+
+
+async def get_play_tracking(
+    backend: DataBackend, game_id: int, play_id: int
+) -> tuple[pd.DataFrame, pd.DataFrame, PlayTracking]:
+    game_data, play_data, tracking_data = await get_play_frames(
+        backend, game_id, play_id
     )
-    trackingattrs = (
-        "gameid,playid,nflid,playdirection,club,frameid,s,a,dir,dis,displayname,x,y"
+    with timed("dataframe"):
+        tracking = PlayTracking.from_dataframe(
+            to_field_names(tracking_data, TrackingData)
+        )
+    return game_data, play_data, tracking
+
+
+async def get_play_data(backend: DataBackend, game_id: int, play_id: int) -> dict:
+    game_data, play_data, tracking_data = await get_play_frames(
+        backend, game_id, play_id
     )
 
-    with db.connection() as connection:
-        game_data = pd.read_sql(
-            f"SELECT {gameattrs} FROM games WHERE gameId = %s",
-            connection,
-            params=(game_id,),
-        )
-        play_data = pd.read_sql(
-            f"SELECT {playattrs} FROM plays WHERE gameId = %s AND playId = %s",
-            connection,
-            params=(game_id, play_id),
-        )
-        tracking_data = pd.read_sql(
-            f"SELECT {trackingattrs} FROM tracking_data WHERE gameId = %s AND playId = %s",
-            connection,
-            params=(game_id, play_id),
+    with timed("dataframe"):
+        return {
+            "game_data": game_data.to_dict(orient="records"),
+            "play_data": play_data.to_dict(orient="records"),
+            "tracking_data": tracking_data.to_dict(orient="records"),
+        }
+
+
+async def get_batch_play_keys(
+    backend: DataBackend, plays: list[tuple[int, int]], game_id: int | None = None
+) -> list[tuple[int, int]]:
+    """Resolve a batch request to unique (game id, play id) pairs."""
+    keys = list(plays)
+    if game_id is not None:
+        game_plays = await get_plays_by_game(backend, game_id)
+        keys += [(game_id, play["playid"]) for play in game_plays]
+    return list(dict.fromkeys(keys))
+
+
+def _split_plays(
+    chunk: pd.DataFrame,
+) -> list[tuple[tuple[int, int], pd.DataFrame]]:
+    # A play's rows are adjacent, so it ends wherever the key changes
+    keys = chunk[["gameid", "playid"]].to_numpy()
+    starts = np.flatnonzero((keys[1:] != keys[:-1]).any(axis=1)) + 1
+    bounds = [0, *starts.tolist(), len(chunk)]
+    return [
+        ((int(keys[start][0]), int(keys[start][1])), chunk.iloc[start:end])
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+
+async def stream_play_frames(
+    backend: DataBackend, keys: list[tuple[int, int]], chunk_rows: int
+) -> AsyncIterator[KeyedPlayFrames]:
+    """Yield iter_play_frames results, holding at most about two chunks of rows.
+
+    Plays come in the order the backend streams them, and plays without
+    tracking rows come last.
+    """
+    with timed("db_query"):
+        game_data, play_data = await backend.read_play_metadata(keys)
+    with timed("dataframe"):
+        games = game_data.groupby("gameid").indices
+        plays = play_data.groupby(["gameid", "playid"]).indices
+
+    def play_frames(key: tuple[int, int], rows: list[pd.DataFrame]) -> KeyedPlayFrames:
+        if len(rows) > 1:
+            tracking_data = pd.concat(rows)
+        elif rows:
+            tracking_data = rows[0]
+        else:
+            tracking_data = no_rows
+        return (
+            key,
+            _group_rows(game_data, games.get(key[0])),
+            _group_rows(play_data, plays.get(key)),
+            tracking_data,
         )
 
-    # Handle NaN and infinity values for 'dir' column
-    tracking_data["dir"] = (
-        tracking_data["dir"].replace([np.inf, -np.inf], np.nan).fillna(0)
-    )
+    # The last play of a chunk may continue in the next one, so hold it back
+    streamed: set[tuple[int, int]] = set()
+    pending_key, pending = None, []
+    # Typed like the streamed rows once any arrive
+    no_rows = pd.DataFrame(columns=TRACKING_COLUMNS)
+    chunks = backend.stream_tracking(keys, chunk_rows)
+    try:
+        while True:
+            with timed("db_query"):
+                chunk = await anext(chunks, None)
+            if chunk is None:
+                break
+            check_tracking_data(chunk)
+            with timed("dataframe"):
+                parts = _split_plays(chunk)
+            no_rows = chunk.iloc[:0].copy()
+            for key, rows in parts:
+                if key != pending_key:
+                    if pending_key is not None:
+                        yield play_frames(pending_key, pending)
+                    streamed.add(key)
+                    pending_key, pending = key, []
+                pending.append(rows)
+    finally:
+        await chunks.aclose()
+
+    if pending_key is not None:
+        yield play_frames(pending_key, pending)
+    for key in keys:
+        if key not in streamed:
+            yield play_frames(key, [])
+
+
+async def iter_play_frames(
+    backend: DataBackend, keys: list[tuple[int, int]]
+) -> AsyncIterator[KeyedPlayFrames]:
+    """Yield get_play_frames results for many plays, reading them in chunks."""
+    chunk_rows = get_settings().tracking_stream_rows
+    if chunk_rows > 0:
+        async for play in stream_play_frames(backend, keys, chunk_rows):
+            yield play
+        return
+
+    for start in range(0, len(keys), BATCH_CHUNK_SIZE):
+        chunk = keys[start : start + BATCH_CHUNK_SIZE]
+        with timed("db_query"):
+            game_data, play_data, tracking_data = await backend.read_play_batch(chunk)
+        check_tracking_data(tracking_data)
+
+        with timed("dataframe"):
+            games = game_data.groupby("gameid").indices
+            plays = play_data.groupby(["gameid", "playid"]).indices
+            tracking = tracking_data.groupby(["gameid", "playid"]).indices
+        for key in chunk:
+            yield (
+                key,
+                _group_rows(game_data, games.get(key[0])),
+                _group_rows(play_data, plays.get(key)),
+                _group_rows(tracking_data, tracking.get(key)),
+            )
 
-    # Handle null values for 'nflid' column
-    tracking_data["nflid"] = tracking_data["nflid"].fillna(0).astype(int)
 
-    return {
-        "game_data": game_data.to_dict(orient="records"),
-        "play_data": play_data.to_dict(orient="records"),
-        "tracking_data": tracking_data.to_dict(orient="records"),
-    }
+async def iter_play_data(
+    backend: DataBackend, keys: list[tuple[int, int]]
+) -> AsyncIterator[dict]:
+    """Yield get_play_data results for many plays, reading them in chunks."""
+    async for _, game_data, play_data, tracking_data in iter_play_frames(
+        backend, keys
+    ):
+        with timed("dataframe"):
+            play = {
+                "game_data": game_data.to_dict(orient="records"),
+                "play_data": play_data.to_dict(orient="records"),
+                "tracking_data": tracking_data.to_dict(orient="records"),
+            }
+        yield play
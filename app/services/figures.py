@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Self
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+from app.config import get_settings
+from app.modules.animation import (
+    AnimationConfig,
+    ColorProvider,
+    PlayAnimator,
+    get_color_manager,
+)
+from app.schemas.game import Game
+from app.schemas.play import Play
+from app.schemas.tracking import TrackingData
+from app.services import crud
+from app.services.backends import DataBackend
+from app.services.serialization import to_field_names
+from app.utils.metrics import timed
+
+
+class FigureCache:
+    """Two-tier cache of rendered figure JSON: an in-memory LRU over a disk store."""
+
+    def __init__(self: Self, directory: Path, max_entries: int, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        game_id: int, play_id: int, config: AnimationConfig, color_version: str
+    ) -> str:
+        """Build a cache key from everything that changes the rendered figure."""
+        parts = [game_id, play_id, asdict(config), color_version]
+        return hashlib.sha256(
+            json.dumps(parts, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _path(self: Self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self: Self, key: str) -> bytes | None:
+        """Return a cached figure, promoting disk hits into memory."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            value = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Bump the modification time so disk eviction is least recently used
+        path.touch()
+
+        self._remember(key, value)
+        return value
+
+    def put(self: Self, key: str, value: bytes) -> None:
+        """Store a figure in memory and on disk."""
+        self._remember(key, value)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(value)
+        tmp_path.replace(path)
+        self._evict_disk()
+
+    def _remember(self: Self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self: Self) -> None:
+        """Delete the least recently used files until the store fits in max_bytes."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+
+# Share one cache per process
+@lru_cache()
+def get_figure_cache() -> FigureCache:
+    settings = get_settings()
+    return FigureCache(
+        settings.figure_cache_dir,
+        max_entries=settings.figure_cache_memory_entries,
+        max_bytes=settings.figure_cache_disk_bytes,
+    )
+
+
+def build_figure(
+    game_data: pd.DataFrame,
+    play_data: pd.DataFrame,
+    tracking_data: pd.DataFrame,
+    color_provider: ColorProvider,
+    config: AnimationConfig,
+) -> go.Figure:
+    """Animate crud's play DataFrames."""
+    return create_animator(
+        game_data, play_data, tracking_data, color_provider, config
+    ).create_animation()
+
+
+def create_animator(
+    game_data: pd.DataFrame,
+    play_data: pd.DataFrame,
+    tracking_data: pd.DataFrame,
+    color_provider: ColorProvider,
+    config: AnimationConfig,
+) -> PlayAnimator:
+    return PlayAnimator(
+        game_df=to_field_names(game_data, Game),
+        play_df=to_field_names(play_data, Play),
+        tracking_df=to_field_names(tracking_data, TrackingData),
+        color_provider=color_provider,
+        config=config,
+    )
+
+
+def render_figure(
+    game_data: pd.DataFrame,
+    play_data: pd.DataFrame,
+    tracking_data: pd.DataFrame,
+    color_provider: ColorProvider,
+    config: AnimationConfig,
+) -> bytes:
+    """Render crud's play DataFrames to figure JSON."""
+    fig = build_figure(game_data, play_data, tracking_data, color_provider, config)
+    with timed("serialization"):
+        return fig.to_json().encode()
+
+
+def stream_figure(
+    animator: PlayAnimator, batch_size: int, cache: FigureCache, key: str
+) -> Iterator[bytes]:
+    """Render a play as NDJSON lines, sending each part as soon as it is built.
+
+    The first line is {"figure": ...}, the figure without its frames. Each
+    later line is {"frames": [...]}, the next batch_size frames to append to
+    the figure's frames. The response has already started, so a failure
+    ends the stream with an {"error": ...} line instead.
+
+    Once every batch is sent, the assembled figure is cached under key, as
+    get_play_figure would have cached it.
+    """
+    try:
+        batches = animator.iter_animation(batch_size)
+        fig = next(batches)
+        with timed("serialization"):
+            figure_json = fig.to_json().encode()
+        yield b'{"figure":' + figure_json + b"}\n"
+
+        frames_json = []
+        for frames in batches:
+            with timed("serialization"):
+                content = to_json_plotly([frame.to_plotly_json() for frame in frames])
+                frames_json.append(content[1:-1].encode())
+            yield b'{"frames":' + content.encode() + b"}\n"
+    except Exception as e:
+        yield b'{"error":' + json.dumps(str(e)).encode() + b"}\n"
+        return
+
+    # Splice the frames in the way fig.to_json() would write them
+    if frames_json:
+        figure_json = (
+            figure_json[:-1] + b',"frames":[' + b",".join(frames_json) + b"]}"
+        )
+    cache.put(key, figure_json)
+
+
+# Renders still running, so concurrent requests for a figure render it once
+_renders: dict[str, asyncio.Task[bytes]] = {}
+
+
+async def _render_play_figure(
+    backend: DataBackend,
+    game_id: int,
+    play_id: int,
+    config: AnimationConfig,
+    color_provider: ColorProvider,
+    cache: FigureCache,
+    key: str,
+) -> bytes:
+    game_data, play_data, tracking_data = await crud.get_play_frames(
+        backend, game_id, play_id
+    )
+    figure_json = await asyncio.to_thread(
+        render_figure, game_data, play_data, tracking_data, color_provider, config
+    )
+    await asyncio.to_thread(cache.put, key, figure_json)
+    return figure_json
+
+
+async def get_play_figure_stream(
+    backend: DataBackend,
+    game_id: int,
+    play_id: int,
+    config: AnimationConfig,
+    batch_size: int,
+) -> Iterator[bytes]:
+    """Stream the play's figure, or send a cached figure whole in one line.
+
+    A figure get_play_figure is already rendering is also sent whole, once
+    that render finishes, rather than rendered a second time.
+    """
+    color_provider = get_color_manager()
+    cache = get_figure_cache()
+    key = cache.make_key(game_id, play_id, config, color_provider.version)
+
+    figure_json = await asyncio.to_thread(cache.get, key)
+    if figure_json is None and key in _renders:
+        figure_json = await asyncio.shield(_renders[key])
+    if figure_json is not None:
+        return iter([b'{"figure":' + figure_json + b"}\n"])
+
+    game_data, play_data, tracking_data = await crud.get_play_frames(
+        backend, game_id, play_id
+    )
+    # Set up before streaming starts, so bad play data still fails the request
+    animator = await asyncio.to_thread(
+        create_animator, game_data, play_data, tracking_data, color_provider, config
+    )
+    # A sync iterator, so StreamingResponse renders it on a worker thread
+    return stream_figure(animator, batch_size, cache, key)
+
+
+async def get_play_figure(
+    backend: DataBackend, game_id: int, play_id: int, config: AnimationConfig
+) -> bytes:
+    """Return the play's figure JSON, rendering it only on a cache miss.
+
+    Requests that miss while the same figure is rendering wait for that render.
+    """
+    color_provider = get_color_manager()
+    cache = get_figure_cache()
+    key = cache.make_key(game_id, play_id, config, color_provider.version)
+
+    # Disk reads and rendering run on worker threads to keep the event loop free
+    figure_json = await asyncio.to_thread(cache.get, key)
+    if figure_json is not None:
+        return figure_json
+
+    render = _renders.get(key)
+    if render is None:
+        render = asyncio.create_task(
+            _render_play_figure(
+                backend, game_id, play_id, config, color_provider, cache, key
+            )
+        )
+        _renders[key] = render
+
+        def finished(task: asyncio.Task[bytes]) -> None:
+            del _renders[key]
+            # Waiters see any failure; don't also report it as never retrieved
+            task.cancelled() or task.exception()
+
+        render.add_done_callback(finished)
+    # A disconnecting client must not cancel the render for the others
+    return await asyncio.shield(render)
@@ -0,0 +1,248 @@
+import json
+import struct
+from functools import cache
+from typing import Any, Final
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pydantic_core
+from numpy.typing import NDArray
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from app.modules.animation.types import PlayTracking
+from app.schemas.game import Game
+from app.schemas.play import Play
+from app.schemas.tracking import TrackingData
+from app.utils.metrics import timed
+
+ARROW_STREAM_MEDIA_TYPE: Final[str] = "application/vnd.apache.arrow.stream"
+COMPACT_MEDIA_TYPE: Final[str] = "application/vnd.nfl-play.compact"
+
+# Magic and version, then the header length, header JSON and array buffers
+COMPACT_MAGIC: Final[bytes] = b"NFLP\x02"
+COMPACT_HEADER_LENGTH: Final[struct.Struct] = struct.Struct("<I")
+# Tracking is recorded to the hundredth of a yard, second or degree
+COMPACT_SCALE: Final[int] = 100
+# Kinematics in degrees, whose steps wrap around the circle
+COMPACT_ANGLES: Final[frozenset[str]] = frozenset({"dir"})
+COMPACT_TURN: Final[int] = 360 * COMPACT_SCALE
+
+# From here up, orjson writes exponents as 1e+16 where pydantic writes 1e16
+ORJSON_FLOAT_LIMIT: Final[float] = 1e16
+
+
+def to_field_names(df: pd.DataFrame, model: type[BaseModel]) -> pd.DataFrame:
+    """Rename database column aliases to the schema's field names."""
+    aliases = {
+        field.alias: name for name, field in model.model_fields.items() if field.alias
+    }
+    return df.rename(columns=aliases)
+
+
+def play_frames_to_arrow(
+    game_data: pd.DataFrame, play_data: pd.DataFrame, tracking_data: pd.DataFrame
+) -> bytes:
+    """Encode a play as an Arrow IPC stream of its tracking rows.
+
+    The single-row game and play tables travel as JSON in the schema metadata.
+    """
+    table = pa.Table.from_pandas(
+        to_field_names(tracking_data, TrackingData), preserve_index=False
+    )
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"game_data": to_field_names(game_data, Game).to_json(orient="records"),
+        b"play_data": to_field_names(play_data, Play).to_json(orient="records"),
+    })
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_to_play_frames(
+    content: bytes,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Decode an Arrow IPC play stream into game, play and tracking DataFrames."""
+    with pa.ipc.open_stream(pa.py_buffer(content)) as reader:
+        table = reader.read_all()
+
+    metadata = table.schema.metadata
+    game_data = pd.DataFrame(json.loads(metadata[b"game_data"]))
+    play_data = pd.DataFrame(json.loads(metadata[b"play_data"]))
+    tracking_data = table.to_pandas(split_blocks=True, self_destruct=True)
+    return game_data, play_data, tracking_data
+
+
+def _encode_deltas(
+    values: NDArray[np.float64], angle: bool = False
+) -> tuple[NDArray, NDArray | None]:
+    # Quantize, then difference along frames, so each player's row of a
+    # (players x frames) array starts absolute and continues with small steps
+    missing = np.isnan(values)
+    quantized = np.round(np.where(missing, 0.0, values) * COMPACT_SCALE)
+    if missing.any():
+        # Repeat the last value across gaps, so a player leaving and returning
+        # costs a step rather than two jumps through zero
+        last = np.where(missing, 0, np.arange(values.shape[1]))
+        np.maximum.accumulate(last, axis=1, out=last)
+        quantized = np.take_along_axis(quantized, last, axis=1)
+    deltas = np.diff(quantized.astype(np.int64), axis=1, prepend=0)
+    if angle:
+        # Take the short way around, so 359.99 -> 0.01 is a step of 0.02
+        deltas = (deltas + COMPACT_TURN // 2) % COMPACT_TURN - COMPACT_TURN // 2
+    int16 = np.iinfo(np.int16)
+    fits = int16.min <= deltas.min(initial=0) and deltas.max(initial=0) <= int16.max
+    dtype = "<i2" if fits else "<i4"
+    return deltas.astype(dtype), np.packbits(missing) if missing.any() else None
+
+
+def _decode_deltas(
+    deltas: NDArray, missing: NDArray[np.uint8] | None, angle: bool = False
+) -> NDArray[np.float64]:
+    values = np.cumsum(deltas, axis=1, dtype=np.int64)
+    if angle:
+        values %= COMPACT_TURN
+    values = values / COMPACT_SCALE
+    if missing is not None:
+        mask = np.unpackbits(missing, count=values.size).reshape(values.shape)
+        values[mask.astype(bool)] = np.nan
+    return values
+
+
+def play_tracking_to_compact(
+    game_data: pd.DataFrame, play_data: pd.DataFrame, tracking: PlayTracking
+) -> bytes:
+    """Encode a play in the compact codec.
+
+    Per-play fields and each player's id, club and name are sent once in a JSON
+    header. Each kinematic follows as a (players x frames) array of per-player
+    frame deltas, quantized to COMPACT_SCALE. Those are int16 unless a step
+    overflows, with a bitmask of missing values when there are any. Angles
+    step the short way around the circle and decode to [0, 360).
+    """
+    arrays, buffers = [], []
+    for column in PlayTracking.KINEMATICS:
+        deltas, missing = _encode_deltas(
+            getattr(tracking, column).T, column in COMPACT_ANGLES
+        )
+        arrays.append([column, deltas.dtype.str, list(deltas.shape)])
+        buffers.append(deltas.tobytes())
+        if missing is not None:
+            arrays.append([f"{column}_missing", missing.dtype.str, list(missing.shape)])
+            buffers.append(missing.tobytes())
+
+    header = orjson.dumps(
+        {
+            "game_data": to_field_names(game_data, Game).to_dict(orient="records"),
+            "play_data": to_field_names(play_data, Play).to_dict(orient="records"),
+            "game_id": tracking.game_id,
+            "play_id": tracking.play_id,
+            "play_direction": tracking.play_direction,
+            "frame_ids": tracking.frame_ids,
+            "nfl_ids": tracking.nfl_ids,
+            "clubs": tracking.clubs.tolist(),
+            "display_names": tracking.display_names.tolist(),
+            "arrays": arrays,
+        },
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+    return b"".join(
+        [COMPACT_MAGIC, COMPACT_HEADER_LENGTH.pack(len(header)), header, *buffers]
+    )
+
+
+def compact_to_play_tracking(
+    content: bytes,
+) -> tuple[pd.DataFrame, pd.DataFrame, PlayTracking]:
+    """Decode a compact play into game and play DataFrames and its tracking."""
+    if not content.startswith(COMPACT_MAGIC):
+        raise ValueError("Not a compact play payload")
+    offset = len(COMPACT_MAGIC)
+    (header_length,) = COMPACT_HEADER_LENGTH.unpack_from(content, offset)
+    offset += COMPACT_HEADER_LENGTH.size
+    header = orjson.loads(content[offset : offset + header_length])
+    offset += header_length
+
+    buffers = {}
+    for name, dtype, shape in header["arrays"]:
+        array = np.frombuffer(content, dtype=dtype, count=np.prod(shape), offset=offset)
+        buffers[name] = array.reshape(shape)
+        offset += array.nbytes
+
+    tracking = PlayTracking(
+        game_id=header["game_id"],
+        play_id=header["play_id"],
+        play_direction=header["play_direction"],
+        frame_ids=np.asarray(header["frame_ids"], dtype=np.int64),
+        nfl_ids=np.asarray(header["nfl_ids"], dtype=np.int64),
+        clubs=np.asarray(header["clubs"], dtype=object),
+        display_names=np.asarray(header["display_names"], dtype=object),
+        **{
+            column: _decode_deltas(
+                buffers[column],
+                buffers.get(f"{column}_missing"),
+                column in COMPACT_ANGLES,
+            ).T
+            for column in PlayTracking.KINEMATICS
+        },
+    )
+    return (
+        pd.DataFrame(header["game_data"]),
+        pd.DataFrame(header["play_data"]),
+        tracking,
+    )
+
+
+@cache
+def _list_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(list[annotation])
+
+
+def validate_columns(df: pd.DataFrame, model: type[BaseModel]) -> list[dict]:
+    """Validate a frame against a model one column at a time.
+
+    Applies the same coercions as validating each row as the model, and
+    returns the rows keyed by alias, in field order.
+    """
+    keys, columns = [], []
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        try:
+            values = df[key].tolist()
+            columns.append(_list_adapter(field.annotation).validate_python(values))
+        except (KeyError, ValidationError) as e:
+            raise ValueError(f"Invalid {model.__name__}.{key}: {e}") from e
+        keys.append(key)
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def _floats_fit_orjson(df: pd.DataFrame, model: type[BaseModel]) -> bool:
+    names = [
+        field.alias or name
+        for name, field in model.model_fields.items()
+        if field.annotation is float
+    ]
+    values = df[names].to_numpy(dtype="float64")
+    return not (np.abs(values[np.isfinite(values)]) >= ORJSON_FLOAT_LIMIT).any()
+
+
+def play_frames_to_json(
+    game_data: pd.DataFrame, play_data: pd.DataFrame, tracking_data: pd.DataFrame
+) -> bytes:
+    """Serialize a play byte for byte as PlayResponse.model_dump_json(by_alias=True).
+
+    Columns are validated instead of rows and the result is encoded with orjson,
+    skipping the per-row model instances.
+    """
+    with timed("validation"):
+        content = {
+            "game_data": validate_columns(game_data, Game),
+            "play_data": validate_columns(play_data, Play),
+            "tracking_data": validate_columns(tracking_data, TrackingData),
+        }
+    with timed("serialization"):
+        if _floats_fit_orjson(tracking_data, TrackingData):
+            return orjson.dumps(content)
+        return pydantic_core.to_json(content, inf_nan_mode="null")
@@ -0,0 +1,70 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, Self, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[T]):
+    """A thread-safe LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(self: Self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self: Self, key: Hashable, default: Any = None) -> T | Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self: Self, key: Hashable, value: T) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
+
+
+def ttl_cache(
+    maxsize: int = 1024, ttl: float = 3600.0
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Cache an async function's results by its arguments in a TTLCache."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        cache: TTLCache[T] = TTLCache(maxsize, ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = (args, tuple(sorted(kwargs.items())))
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = await func(*args, **kwargs)
+                cache.set(key, result)
+            return result
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
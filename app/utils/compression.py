@@ -0,0 +1,42 @@
+import gzip
+from typing import Final
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip always works
+    zstandard = None
+
+# Preferred first
+SUPPORTED_ENCODINGS: Final[tuple[str, ...]] = (
+    ("zstd", "gzip") if zstandard is not None else ("gzip",)
+)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported Content-Encoding the client accepts, if any."""
+    weights = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    for coding in SUPPORTED_ENCODINGS:
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(content: bytes, encoding: str | None) -> bytes:
+    """Compress a response body with a negotiated encoding."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(content)
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=6, mtime=0)
+    return content
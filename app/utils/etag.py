@@ -0,0 +1,35 @@
+import hashlib
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.utils.metrics import timed
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from a response body."""
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches an ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def etag_json_response(
+    request: Request, model: BaseModel, max_age: int = 3600
+) -> Response:
+    """Serialize a response model with an ETag, or answer 304 if the client has it."""
+    with timed("serialization"):
+        response = JSONResponse(model.model_dump(mode="json", by_alias=True))
+        etag = make_etag(response.body)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
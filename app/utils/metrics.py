@@ -0,0 +1,181 @@
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Final, Self, TypeVar
+
+T = TypeVar("T")
+
+PROMETHEUS_MEDIA_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus' default buckets, plus finer ones for sub-10ms stages
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r'\"').replace("\n", r"\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not labelnames:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(
+        self: Self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self: Self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self: Self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_total{labels} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self: Self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = (*sorted(buckets), math.inf)
+        # Per label set: one count per bucket, then the sum of observations
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self: Self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            counts = self._values.setdefault(key, [0.0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-1] += value
+
+    def samples(self: Self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(
+                (key, list(counts)) for key, counts in self._values.items()
+            )
+        for key, counts in values:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*key, _format_value(bound))
+                )
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(counts[-1])}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+
+class MetricsRegistry:
+    """Named metrics for one process, rendered in the Prometheus text format.
+
+    Every worker process keeps its own registry, so scrape each worker.
+    """
+
+    def __init__(self: Self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _register(self: Self, metric: T) -> T:
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(f"{metric.name} is already a {existing.kind}")
+        return existing
+
+    def counter(
+        self: Self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self: Self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self: Self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "nfl_stage_duration_seconds",
+    "Time spent in each stage of serving a play.",
+    ("stage",),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "nfl_http_request_duration_seconds",
+    "Time until the response headers are sent, by route.",
+    ("method", "route", "status"),
+)
+REQUESTS = REGISTRY.counter(
+    "nfl_http_requests",
+    "Requests handled, by route.",
+    ("method", "route", "status"),
+)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Record how long the block takes under a stage label.
+
+    Wrapping an await records wall time, including any wait on the event loop.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
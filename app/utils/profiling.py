@@ -0,0 +1,111 @@
+"""Opt-in cProfile runs of single API requests.
+
+With the profiling_enabled setting on, a request sent with an ``X-Profile``
+header or a ``profile`` query parameter runs under cProfile:
+
+- ``file`` (or any other value) dumps pstats to profile_dir and names the file
+  in an ``X-Profile-Path`` response header.
+- ``inline`` replaces the response body with the top functions by cumulative
+  time, with the original status in ``X-Profile-Status``.
+
+cProfile on Python 3.12+ sees every thread in the process, so it also covers the
+crud and animator work that runs in worker threads. That also means only one
+request can be profiled at a time; others run normally and are answered with
+``X-Profile: busy``.
+"""
+
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Final, Self
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import get_settings
+
+PROFILE_HEADER: Final[str] = "x-profile"
+PROFILE_QUERY: Final[str] = "profile"
+INLINE_STATS_LINES: Final[int] = 60
+
+_profiler_lock = threading.Lock()
+
+
+def _profile_mode(request: Request) -> str | None:
+    return request.headers.get(PROFILE_HEADER) or request.query_params.get(
+        PROFILE_QUERY
+    )
+
+
+def _profile_path(directory: Path, request: Request) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_")
+    return directory / f"{time.time_ns()}-{request.method}-{slug}.prof"
+
+
+async def profile_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Middleware that profiles requests which ask for it."""
+    mode = _profile_mode(request)
+    if mode is None:
+        return await call_next(request)
+    if not _profiler_lock.acquire(blocking=False):
+        response = await call_next(request)
+        response.headers["X-Profile"] = "busy"
+        return response
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            response = await call_next(request)
+            # Drain streaming bodies inside the profile so their work is counted
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        finally:
+            profiler.disable()
+    finally:
+        _profiler_lock.release()
+
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key != "content-length"
+    }
+    if mode == "inline":
+        headers.pop("content-type", None)
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(INLINE_STATS_LINES)
+        headers["X-Profile-Status"] = str(response.status_code)
+        return Response(stream.getvalue(), media_type="text/plain", headers=headers)
+
+    directory = get_settings().profile_dir
+    directory.mkdir(parents=True, exist_ok=True)
+    path = _profile_path(directory, request)
+    profiler.dump_stats(path)
+    headers["X-Profile-Path"] = str(path)
+    return Response(body, status_code=response.status_code, headers=headers)
+
+
+class ProfilingMiddleware:
+    """Installs profile_requests at startup if the profiling_enabled setting is on.
+
+    The setting is read on the first call, the lifespan startup event, rather
+    than when the app is imported. With it off, calls go straight to the app.
+    """
+
+    def __init__(self: Self, app: ASGIApp) -> None:
+        self.app = app
+        self.handler: ASGIApp | None = None
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.handler is None:
+            if get_settings().profiling_enabled:
+                self.handler = BaseHTTPMiddleware(self.app, dispatch=profile_requests)
+            else:
+                self.handler = self.app
+        await self.handler(scope, receive, send)
@@ -0,0 +1,198 @@
+"""Seeded synthetic games, plays and tracking data.
+
+Frames come back with the database column names the backends return (see
+app.services.backends.base), so they can stand in for a real data store in tests
+and benchmarks. Tracking rows are raw, as in the Big Data Bowl CSVs; pass them
+through clean_tracking_data, as ingestion does, and to_field_names before
+handing them to PlayAnimator.
+"""
+
+from typing import Final
+import numpy as np
+import pandas as pd
+from app.services.backends.base import (
+    GAME_COLUMNS,
+    PLAY_COLUMNS,
+    PLAY_SUMMARY_COLUMNS,
+    TRACKING_COLUMNS,
+)
+
+# Tracking data is sampled at 10 Hz
+FRAME_INTERVAL: Final[float] = 0.1
+FIELD_LENGTH: Final[float] = 120.0
+FIELD_WIDTH: Final[float] = 53.3
+
+# Offense then defense: yards off the line of scrimmage and across the field
+OFFENSE_FORMATION: Final[list[tuple[float, float]]] = [
+    (1.0, 26.65), (1.0, 23.65), (1.0, 29.65), (1.0, 20.65), (1.0, 32.65),
+    (5.0, 26.65), (7.0, 26.65), (1.0, 6.0), (1.0, 47.0), (1.5, 12.0), (1.5, 38.0),
+]
+DEFENSE_FORMATION: Final[list[tuple[float, float]]] = [
+    (1.0, 22.0), (1.0, 25.0), (1.0, 28.5), (1.0, 31.5), (4.5, 20.0),
+    (4.5, 26.65), (4.5, 33.0), (7.0, 6.0), (7.0, 47.0), (12.0, 18.0), (12.0, 35.0),
+]
+QUARTERBACK: Final[int] = 5
+
+SURNAMES: Final[list[str]] = [
+    "Allen", "Brown", "Davis", "Evans", "Green", "Harris", "Jackson", "Johnson",
+    "Jones", "Kelce", "Lewis", "Mahomes", "Miller", "Moore", "Smith", "Taylor",
+    "Thomas", "Walker", "White", "Williams", "Wilson", "Young",
+]
+
+
+def _player_motion(
+    rng: np.random.Generator, start: np.ndarray, heading: np.ndarray, n_frames: int
+) -> tuple[np.ndarray, ...]:
+    """Integrate smooth random runs from the players' starting spots."""
+    n_players = len(start)
+    t = np.arange(n_frames)[:, None] * FRAME_INTERVAL
+
+    # Players accelerate towards a top speed while their heading drifts
+    top_speed = rng.uniform(3.0, 9.0, n_players)
+    speed = top_speed * (1 - np.exp(-t / rng.uniform(0.5, 1.5, n_players)))
+    speed = np.clip(speed + rng.normal(0, 0.1, speed.shape), 0, None)
+    heading = (heading + np.cumsum(rng.normal(0, 4.0, speed.shape), axis=0)) % 360
+
+    # Tracking directions are clockwise from the +y axis
+    radians = np.deg2rad(heading)
+    step = speed * FRAME_INTERVAL
+    x = start[:, 0] + np.cumsum(step * np.sin(radians), axis=0)
+    y = start[:, 1] + np.cumsum(step * np.cos(radians), axis=0)
+    acceleration = np.abs(np.diff(speed, axis=0, prepend=speed[:1])) / FRAME_INTERVAL
+    return (
+        np.clip(x, 0, FIELD_LENGTH),
+        np.clip(y, 0, FIELD_WIDTH),
+        speed,
+        acceleration,
+        heading,
+        step,
+    )
+
+
+def _ball_path(
+    rng: np.random.Generator, x: np.ndarray, y: np.ndarray, n_frames: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Follow the quarterback, then fly to a receiver and follow them."""
+    snap = min(n_frames - 1, max(1, n_frames // 4))
+    flight = max(1, min(15, n_frames - snap - 1))
+    receiver = int(rng.choice([7, 8, 9, 10]))
+
+    ball_x, ball_y = x[:, QUARTERBACK].copy(), y[:, QUARTERBACK].copy()
+    catch = snap + flight
+    ball_x[catch:], ball_y[catch:] = x[catch:, receiver], y[catch:, receiver]
+    if catch < n_frames:
+        weight = np.linspace(0, 1, flight + 1)[1:]
+        ball_x[snap:catch] = (1 - weight) * x[snap, QUARTERBACK] + weight * x[
+            catch, receiver
+        ]
+        ball_y[snap:catch] = (1 - weight) * y[snap, QUARTERBACK] + weight * y[
+            catch, receiver
+        ]
+    return ball_x, ball_y
+
+
+def generate_game(
+    game_id: int = 2022090800,
+    home_team: str = "KC",
+    visitor_team: str = "BUF",
+) -> pd.DataFrame:
+    """One GAME_COLUMNS row."""
+    return pd.DataFrame([[game_id, home_team, visitor_team]], columns=GAME_COLUMNS)
+
+
+def generate_play(
+    game_id: int = 2022090800,
+    play_id: int = 56,
+    n_frames: int = 120,
+    seed: int = 0,
+    home_team: str = "KC",
+    visitor_team: str = "BUF",
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Game, play and tracking frames for one play, as returned by read_play.
+
+    The tracking frame has 22 players and the ball for each of n_frames frames.
+    The ball has a null nflid and direction, as in the raw tracking CSVs.
+    """
+    rng = np.random.default_rng(seed)
+    play_direction = "right" if rng.random() < 0.5 else "left"
+    sign = 1.0 if play_direction == "right" else -1.0
+    line_of_scrimmage = float(rng.integers(20, 101))
+    yards_to_go = int(rng.integers(1, 11))
+
+    offense, defense = rng.permutation([home_team, visitor_team])
+    formation = np.array(OFFENSE_FORMATION + DEFENSE_FORMATION)
+    is_offense = np.arange(len(formation)) < len(OFFENSE_FORMATION)
+    side = np.where(is_offense, -sign, sign)
+    start = np.column_stack(
+        (line_of_scrimmage + side * formation[:, 0], formation[:, 1])
+    )
+
+    # Offense runs downfield, defense comes back towards it
+    downfield = 90.0 if sign > 0 else 270.0
+    heading = np.where(is_offense, downfield, (downfield + 180) % 360)
+    x, y, s, a, direction, dis = _player_motion(rng, start, heading, n_frames)
+    ball_x, ball_y = _ball_path(rng, x, y, n_frames)
+    ball_step = np.hypot(
+        np.diff(ball_x, prepend=ball_x[0]), np.diff(ball_y, prepend=ball_y[0])
+    )
+
+    n_players = len(start)
+    clubs = np.repeat([offense, defense], len(OFFENSE_FORMATION))
+    nfl_ids = np.concatenate((
+        40000 + rng.choice(10000, len(OFFENSE_FORMATION), replace=False),
+        50000 + rng.choice(10000, len(DEFENSE_FORMATION), replace=False),
+    ))
+    names = [
+        f"{chr(65 + rng.integers(26))}.{rng.choice(SURNAMES)}" for _ in range(n_players)
+    ]
+
+    # One row per player per frame, then the ball, ordered by frame
+    frame_ids = np.arange(1, n_frames + 1)
+    football = np.full(n_frames, "football")
+    tracking = pd.DataFrame(
+        {
+            "gameid": game_id,
+            "playid": play_id,
+            "nflid": np.concatenate(
+                (np.tile(nfl_ids, n_frames).astype(float), np.full(n_frames, np.nan))
+            ),
+            "playdirection": play_direction,
+            "club": np.concatenate((np.tile(clubs, n_frames), football)),
+            "frameid": np.concatenate((np.repeat(frame_ids, n_players), frame_ids)),
+            "s": np.concatenate((s.ravel(), ball_step / FRAME_INTERVAL)),
+            "a": np.concatenate((a.ravel(), np.zeros(n_frames))),
+            "dir": np.concatenate((direction.ravel(), np.full(n_frames, np.nan))),
+            "dis": np.concatenate((dis.ravel(), ball_step)),
+            "displayname": np.concatenate((np.tile(names, n_frames), football)),
+            "x": np.concatenate((x.ravel(), ball_x)),
+            "y": np.concatenate((y.ravel(), ball_y)),
+        },
+        columns=TRACKING_COLUMNS,
+    )
+    tracking = tracking.sort_values("frameid", kind="stable", ignore_index=True)
+
+    play = pd.DataFrame(
+        [[
+            game_id,
+            play_id,
+            f"(15:00) {rng.choice(SURNAMES)} pass short right to "
+            f"{rng.choice(SURNAMES)} for {rng.integers(-2, 25)} yards",
+            int(rng.integers(1, 5)),
+            int(rng.integers(1, 5)),
+            line_of_scrimmage,
+            yards_to_go,
+        ]],
+        columns=PLAY_COLUMNS,
+    )
+    return generate_game(game_id, home_team, visitor_team), play, tracking
+
+
+def generate_play_summaries(plays: list[pd.DataFrame], seed: int = 0) -> pd.DataFrame:
+    """PLAY_SUMMARY_COLUMNS rows for a game's plays, in read_plays order."""
+    rng = np.random.default_rng(seed)
+    summaries = pd.concat(plays, ignore_index=True)
+    seconds = rng.integers(0, 900, len(summaries))
+    summaries["gameclock"] = [f"{s // 60:02d}:{s % 60:02d}" for s in seconds]
+    return summaries.sort_values(
+        ["quarter", "gameclock"], ascending=[True, False], ignore_index=True
+    )[PLAY_SUMMARY_COLUMNS]
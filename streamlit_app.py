@@ -1,9 +1,193 @@
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+import orjson
 import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+import plotly.graph_objects as go
+import plotly.io as pio
 from app.modules.animation import animate_play
-from app.schemas.game import GameResponse
-from app.schemas.play_response import PlaySummaryResponse, PlayResponse
+from app.schemas.game import Game, GameResponse
+from app.schemas.play import PlaySummary
+from app.schemas.play_response import PlaySummaryResponse
+from app.services.serialization import COMPACT_MEDIA_TYPE, compact_to_play_tracking
+from app.utils.cache import TTLCache
+
+API_URL = "http://localhost:8000/api"
+
+# Weeks, games and plays never change once a game is ingested
+METADATA_TTL = 3600
+# Figures are large, so keep only the last few plays
+FIGURE_CACHE_ENTRIES = 16
+
+PlayKey = tuple[int, int, bool, tuple[tuple[str, object], ...]]
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Share one keep-alive connection pool across reruns and sessions."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=METADATA_TTL, max_entries=1)
+def fetch_weeks() -> list[int]:
+    response = get_session().get(f"{API_URL}/weeks")
+    response.raise_for_status()
+    return response.json()["weeks"]
+
+
+@st.cache_data(ttl=METADATA_TTL, max_entries=64)
+def fetch_games(week: int) -> list[Game]:
+    response = get_session().get(f"{API_URL}/games/{week}")
+    response.raise_for_status()
+    return GameResponse(**response.json()).games
+
+
+@st.cache_data(ttl=METADATA_TTL, max_entries=256)
+def fetch_plays(game_id: int) -> list[PlaySummary]:
+    response = get_session().get(f"{API_URL}/plays/{game_id}")
+    response.raise_for_status()
+    return PlaySummaryResponse(**response.json()).plays
+
+
+def fetch_play_payload(
+    session: requests.Session,
+    game_id: int,
+    play_id: int,
+    render_on_server: bool,
+    settings: tuple[tuple[str, object], ...],
+) -> bytes:
+    """Download figure JSON from the server, or the play in the compact codec.
+
+    requests asks for gzip and decompresses the body transparently.
+    """
+    if render_on_server:
+        response = session.get(
+            f"{API_URL}/play/{game_id}/{play_id}/figure", params=settings
+        )
+    else:
+        response = session.get(
+            f"{API_URL}/play/{game_id}/{play_id}",
+            headers={"Accept": COMPACT_MEDIA_TYPE},
+        )
+    response.raise_for_status()
+    return response.content
+
+
+@st.cache_resource
+def get_prefetcher() -> tuple[ThreadPoolExecutor, TTLCache[Future[bytes]]]:
+    """Background downloads, keyed by the same arguments as load_figure."""
+    return (
+        ThreadPoolExecutor(max_workers=2),
+        TTLCache(maxsize=FIGURE_CACHE_ENTRIES, ttl=METADATA_TTL),
+    )
+
+
+def prefetch_play(key: PlayKey) -> None:
+    """Start downloading a play while the user is still choosing settings."""
+    executor, downloads = get_prefetcher()
+    if downloads.get(key) is None:
+        # Resolve the session here; cached resources need the script's context
+        downloads.set(key, executor.submit(fetch_play_payload, get_session(), *key))
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner="Loading play...")
+def load_figure(
+    game_id: int,
+    play_id: int,
+    render_on_server: bool,
+    settings: tuple[tuple[str, object], ...],
+) -> go.Figure:
+    """Build a play's figure, cached per play and animation settings."""
+    # Reuse a finished or in-flight prefetch, retrying if it failed
+    _, downloads = get_prefetcher()
+    download = downloads.get((game_id, play_id, render_on_server, settings))
+    if download is None or download.exception() is not None:
+        payload = fetch_play_payload(
+            get_session(), game_id, play_id, render_on_server, settings
+        )
+    else:
+        payload = download.result()
+
+    if render_on_server:
+        return pio.from_json(payload.decode())
+
+    # The decoded tracking is already in the animator's dense layout
+    game_data, play_data, tracking_data = compact_to_play_tracking(payload)
+    return animate_play(
+        selected_game_df=game_data,
+        selected_play_df=play_data,
+        selected_tracking_df=tracking_data,
+        **dict(settings),
+    )
+
+
+def prefetch_ready(key: PlayKey) -> bool:
+    """Whether a play's background download has finished successfully."""
+    _, downloads = get_prefetcher()
+    download = downloads.get(key)
+    return download is not None and download.done() and download.exception() is None
+
+
+def stream_figure(
+    session: requests.Session,
+    game_id: int,
+    play_id: int,
+    settings: tuple[tuple[str, object], ...],
+) -> Iterator[go.Figure]:
+    """Yield the figure once its first frames arrive, then again when complete.
+
+    Raises RuntimeError if the server fails partway through the stream.
+    """
+    response = session.get(
+        f"{API_URL}/play/{game_id}/{play_id}/figure/stream",
+        params=settings,
+        stream=True,
+    )
+    with response:
+        response.raise_for_status()
+        lines = map(orjson.loads, response.iter_lines())
+        first = next(lines)
+        if "error" in first:
+            raise RuntimeError(first["error"])
+        figure = first["figure"]
+        frames = figure.setdefault("frames", [])
+        batches = 0
+        for line in lines:
+            if "error" in line:
+                raise RuntimeError(line["error"])
+            frames.extend(line["frames"])
+            batches += 1
+            if batches == 1:
+                # Playback can start while later frames are still rendering
+                yield go.Figure(figure)
+
+    # A cached figure arrives whole, with no frame batches after it
+    if batches != 1:
+        yield go.Figure(figure)
+
+
+def show_figure(placeholder: DeltaGenerator, fig: go.Figure) -> None:
+    # Update layout for correct aspect ratio
+    fig.update_layout(
+        autosize=True,
+        margin=dict(l=0, r=0, b=0, t=30),
+        yaxis=dict(scaleanchor="x", scaleratio=1),
+    )
+    placeholder.plotly_chart(
+        fig,
+        use_container_width=True,
+        config={
+            "responsive": True,
+            "displayModeBar": False,  # Hide the mode bar for cleaner look
+        },
+    )
+
 
 # Set page configuration for a wider layout
 st.set_page_config(layout="wide")
@@ -11,16 +195,13 @@ st.set_page_config(layout="wide")
 st.title("NFL Play Animator")
 
 # Fetch weeks from the API
-response = requests.get("http://localhost:8000/api/weeks")
-weeks = response.json()["weeks"]
+weeks = fetch_weeks()
 
 # Dropdown for weeks
 selected_week = st.selectbox("Select Week", weeks, format_func=lambda w: f"Week {w}")
 
 # Fetch games for the selected week
-game_response = requests.get(f"http://localhost:8000/api/games/{selected_week}")
-game_data = game_response.json()
-games = GameResponse(**game_data).games
+games = fetch_games(selected_week)
 
 # Dropdown for games, with display of Home vs. Visitor
 game_names = [f"{game.home_team_abbr} vs {game.visitor_team_abbr}" for game in games]
@@ -29,9 +210,7 @@ selected_game_name = st.selectbox("Select Game", game_names)
 selected_game_id = game_ids[selected_game_name]
 
 # Fetch plays for the selected game
-plays_response = requests.get(f"http://localhost:8000/api/plays/{selected_game_id}")
-play_summary = plays_response.json()
-plays = PlaySummaryResponse(**play_summary).plays
+plays = fetch_plays(selected_game_id)
 
 # Dropdown for plays, ordered by quarter and game clock
 play_descriptions = [
@@ -41,50 +220,33 @@ play_ids = {desc: play.play_id for desc, play in zip(play_descriptions, plays)}
 selected_play_desc = st.selectbox("Select Play", play_descriptions)
 selected_play_id = play_ids[selected_play_desc]
 
+# Rendering on the server shares cached figures between every viewer
+render_on_server = st.sidebar.toggle("Render on server", value=True)
+renderer = st.sidebar.radio("Renderer", ["svg", "webgl"], horizontal=True)
+
+# Default animation settings
+animation_settings = {
+    "frame_duration": 100,
+    "transition_duration": 0,
+    "slider_transition_duration": 300,
+    "redraw": False,
+    "static_field": True,
+    "renderer": renderer,
+    "client_hover": True,
+}
+settings = tuple(animation_settings.items())
+play_key = (selected_game_id, selected_play_id, render_on_server, settings)
+prefetch_play(play_key)
+
 if st.button("Animate Play"):
-    response = requests.get(
-        f"http://localhost:8000/api/play/{selected_game_id}/{selected_play_id}"
-    )
-    data = response.json()
-    full_play_response = PlayResponse(**data)
-
-    # Convert data back to DataFrames
-    game_data = pd.DataFrame([
-        item.model_dump() for item in full_play_response.game_data
-    ])
-    play_data = pd.DataFrame([
-        item.model_dump() for item in full_play_response.play_data
-    ])
-    tracking_data = pd.DataFrame([
-        item.model_dump() for item in full_play_response.tracking_data
-    ])
+    selected_play = plays[play_descriptions.index(selected_play_desc)]
 
     # Display play information
     st.subheader("Play Information")
     st.write(f"Game ID: {selected_game_id}")
     st.write(f"Play ID: {selected_play_id}")
-    if not play_data.empty:
-        st.write(
-            f"Play Description: {play_data['quarter'].iloc[0]}Q {play_data['play_description'].iloc[0]}"
-        )
-
-    # Call animate_play function with default animation settings
-    fig = animate_play(
-        selected_game_df=game_data,
-        selected_play_df=play_data,
-        selected_tracking_df=tracking_data,
-        frame_duration=100,
-        transition_duration=0,
-        slider_transition_duration=300,
-        redraw=True,
-    )
-
-    # Display the figure
-    # Update layout for correct aspect ratio
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=0, r=0, b=0, t=30),
-        yaxis=dict(scaleanchor="x", scaleratio=1),
+    st.write(
+        f"Play Description: {selected_play.quarter}Q {selected_play.play_description}"
     )
 
     # Custom CSS for maintaining aspect ratio
@@ -112,13 +274,13 @@ if st.button("Animate Play"):
     )
 
     # Display the figure in a container with controlled width
-    container = st.container()
-    with container:
-        st.plotly_chart(
-            fig,
-            use_container_width=True,
-            config={
-                "responsive": True,
-                "displayModeBar": False,  # Hide the mode bar for cleaner look
-            },
-        )
+    placeholder = st.container().empty()
+    if render_on_server and not prefetch_ready(play_key):
+        # Show the first frames as soon as the server sends them. If the
+        # prefetch is still rendering, the server sends its figure whole.
+        for fig in stream_figure(
+            get_session(), selected_game_id, selected_play_id, settings
+        ):
+            show_figure(placeholder, fig)
+    else:
+        show_figure(placeholder, load_figure(*play_key))
@@ -0,0 +1,107 @@
+"""Timing harness for the benchmark suite.
+
+Timings are stored in tests/benchmarks/baselines.json as multiples of a fixed
+calibration loop timed just before each benchmark, so they carry over between
+machines and ride out a busy one. A benchmark fails when it is more than
+--benchmark-threshold times slower than its baseline. Benchmarks only run
+when selected with -m benchmark. Refresh the baselines with:
+
+    pytest -m benchmark --update-baselines
+"""
+
+import gc
+import json
+import time
+from collections.abc import Callable, Generator
+from pathlib import Path
+from typing import Any, Self
+import pytest
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+# Sub-millisecond timings are mostly noise, so compare them against this floor
+MIN_BASELINE_SECONDS = 0.001
+
+
+def calibrate(rounds: int = 5) -> float:
+    """Best time of a fixed pure-Python workload, as a measure of machine speed."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        sum(i * i for i in range(100_000))
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class Benchmark:
+    """Time a callable and check it against its stored baseline."""
+
+    def __init__(
+        self: Self, baselines: dict[str, float], threshold: float, update: bool
+    ) -> None:
+        self.baselines = baselines
+        self.threshold = threshold
+        self.update = update
+        self.results: dict[str, float] = {}
+
+    def __call__(
+        self: Self,
+        name: str,
+        func: Callable[[], Any],
+        rounds: int = 7,
+        number: int = 1,
+        warmup: int = 1,
+    ) -> float:
+        """Return the best per-call time over rounds of number calls each."""
+        for _ in range(warmup):
+            func()
+        calibration = calibrate()
+
+        # Like timeit, keep garbage collection pauses out of the timings
+        timings = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(number):
+                    func()
+                timings.append((time.perf_counter() - start) / number)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        # The best round is the least affected by scheduling noise
+        best = min(timings)
+        relative = best / calibration
+        self.results[name] = relative
+
+        baseline = self.baselines.get(name)
+        if self.update or baseline is None:
+            return best
+        limit = max(baseline, MIN_BASELINE_SECONDS / calibration) * self.threshold
+        if relative > limit:
+            pytest.fail(
+                f"{name} took {best * 1000:.2f} ms, {relative:.2f} calibration "
+                f"loops, more than {self.threshold}x its baseline of {baseline:.2f}"
+            )
+        return best
+
+
+@pytest.fixture(scope="session")
+def benchmark(request: pytest.FixtureRequest) -> Generator[Benchmark, None, None]:
+    baselines = (
+        json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    )
+    update = request.config.getoption("--update-baselines")
+    bench = Benchmark(
+        baselines, request.config.getoption("--benchmark-threshold"), update
+    )
+    yield bench
+
+    if update and bench.results:
+        baselines.update({
+            name: round(relative, 4) for name, relative in bench.results.items()
+        })
+        BASELINES_PATH.write_text(
+            json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+        )
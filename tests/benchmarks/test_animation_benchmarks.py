@@ -0,0 +1,56 @@
+import plotly.graph_objects as go
+import pytest
+from app.modules.animation import AnimationConfig, ColorManager, PlayAnimator
+from tests.benchmarks.conftest import Benchmark
+from tests.conftest import play_frames
+
+pytestmark = pytest.mark.benchmark
+
+CONFIGS = {
+    "full": AnimationConfig(),
+    "static_field": AnimationConfig(static_field=True, redraw=False),
+    "client_hover": AnimationConfig(static_field=True, redraw=False, client_hover=True),
+}
+
+
+def build(n_frames: int, config: AnimationConfig) -> go.Figure:
+    return PlayAnimator(*play_frames(n_frames), config=config).create_animation()
+
+
+@pytest.mark.parametrize("name", CONFIGS)
+def test_create_animation(benchmark: Benchmark, name: str) -> None:
+    animator = PlayAnimator(*play_frames(120), config=CONFIGS[name])
+    benchmark(f"create_animation[{name}]", animator.create_animation)
+
+
+@pytest.mark.parametrize("n_frames", [60, 240])
+def test_create_animation_frames(benchmark: Benchmark, n_frames: int) -> None:
+    animator = PlayAnimator(*play_frames(n_frames), config=CONFIGS["static_field"])
+    benchmark(f"create_animation[{n_frames} frames]", animator.create_animation)
+
+
+def test_animator_setup(benchmark: Benchmark) -> None:
+    frames = play_frames(120)
+    benchmark("animator_setup", lambda: PlayAnimator(*frames), number=100)
+
+
+@pytest.mark.parametrize("name", ["full", "static_field"])
+def test_figure_to_json(benchmark: Benchmark, name: str) -> None:
+    fig = build(120, CONFIGS[name])
+    benchmark(f"figure_to_json[{name}]", fig.to_json)
+
+
+def test_color_snapshot(benchmark: Benchmark) -> None:
+    benchmark("color_snapshot", ColorManager.from_snapshot, number=100)
+
+
+def test_contrasting_pairs(benchmark: Benchmark) -> None:
+    colors = ColorManager.from_snapshot()
+    teams = list(colors._colors)
+
+    def all_pairs() -> None:
+        for home in teams:
+            for visitor in teams:
+                colors.get_contrasting_pairs(home, visitor)
+
+    benchmark("contrasting_pairs", all_pairs, number=20)
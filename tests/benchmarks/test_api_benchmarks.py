@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.config import get_settings
+from app.services import crud
+from app.services.serialization import COMPACT_MEDIA_TYPE
+from tests.benchmarks.conftest import Benchmark
+from tests.conftest import GAME_ID, WEEK, SyntheticBackend
+
+pytestmark = pytest.mark.benchmark
+
+PLAY_ID = 1
+
+
+def get(client: TestClient, url: str, **kwargs: object) -> None:
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize(
+    ("name", "url"),
+    [
+        ("weeks", "/api/weeks"),
+        ("games", f"/api/games/{WEEK}"),
+        ("plays", f"/api/plays/{GAME_ID}"),
+        ("play", f"/api/play/{GAME_ID}/{PLAY_ID}"),
+    ],
+)
+def test_endpoint(
+    benchmark: Benchmark, client: TestClient, name: str, url: str
+) -> None:
+    benchmark(f"endpoint[{name}]", lambda: get(client, url), number=20)
+
+
+def test_play_arrow(benchmark: Benchmark, client: TestClient) -> None:
+    headers = {"Accept": "application/vnd.apache.arrow.stream"}
+    benchmark(
+        "endpoint[play_arrow]",
+        lambda: get(client, f"/api/play/{GAME_ID}/{PLAY_ID}", headers=headers),
+        number=20,
+    )
+
+
+def test_play_compact(benchmark: Benchmark, client: TestClient) -> None:
+    url = f"/api/play/{GAME_ID}/{PLAY_ID}"
+    headers = {"Accept": COMPACT_MEDIA_TYPE, "Accept-Encoding": "gzip"}
+    benchmark(
+        "endpoint[play_compact]", lambda: get(client, url, headers=headers), number=20
+    )
+
+
+def test_play_fast_json(
+    benchmark: Benchmark, client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "fast_json", True)
+    url = f"/api/play/{GAME_ID}/{PLAY_ID}"
+    benchmark("endpoint[play_fast_json]", lambda: get(client, url), number=20)
+
+
+def test_play_figure(benchmark: Benchmark, client: TestClient) -> None:
+    params = {"static_field": True, "redraw": False}
+    benchmark(
+        "endpoint[figure]",
+        lambda: get(client, f"/api/play/{GAME_ID}/{PLAY_ID}/figure", params=params),
+        rounds=5,
+    )
+
+
+def test_play_figure_stream(benchmark: Benchmark, client: TestClient) -> None:
+    params = {"static_field": True, "redraw": False}
+    benchmark(
+        "endpoint[figure_stream]",
+        lambda: get(
+            client, f"/api/play/{GAME_ID}/{PLAY_ID}/figure/stream", params=params
+        ),
+        rounds=5,
+    )
+
+
+def post_batch(client: TestClient) -> None:
+    response = client.post("/api/plays/batch", json={"game_id": GAME_ID})
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize(
+    ("name", "settings"),
+    [
+        ("batch", {}),
+        ("batch_fast_json", {"fast_json": True}),
+        ("batch_stream", {"tracking_stream_rows": 1000}),
+        ("batch_stream_fast_json", {"tracking_stream_rows": 1000, "fast_json": True}),
+    ],
+)
+def test_play_batch(
+    benchmark: Benchmark,
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    name: str,
+    settings: dict[str, object],
+) -> None:
+    for setting, value in settings.items():
+        monkeypatch.setattr(get_settings(), setting, value)
+    benchmark(f"endpoint[{name}]", lambda: post_batch(client))
+
+
+def test_load_game(benchmark: Benchmark, synthetic_backend: SyntheticBackend) -> None:
+    benchmark(
+        "load_game", lambda: asyncio.run(crud.load_game(synthetic_backend, GAME_ID))
+    )
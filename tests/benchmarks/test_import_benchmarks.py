@@ -0,0 +1,10 @@
+import pytest
+from tests.benchmarks.conftest import Benchmark
+from tests.test_imports import DEFERRED_IMPORTS, import_in_subprocess
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("module", sorted(DEFERRED_IMPORTS))
+def test_import_time(benchmark: Benchmark, module: str) -> None:
+    benchmark(f"import[{module}]", lambda: import_in_subprocess(module), rounds=5)
@@ -0,0 +1,137 @@
+from collections.abc import AsyncIterator, Generator
+from typing import Self
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.dependencies import get_backend
+from app.main import app
+from app.services import crud, figures
+from app.services.cleaning import clean_tracking_data
+from app.schemas.game import Game
+from app.schemas.play import Play
+from app.schemas.tracking import TrackingData
+from app.services.figures import FigureCache
+from app.services.serialization import to_field_names
+from app.utils.cache import TTLCache
+from app.utils.synthetic import generate_game, generate_play, generate_play_summaries
+
+GAME_ID = 2022090800
+WEEK = 1
+PLAYS_PER_GAME = 8
+
+# Benchmarks fail when this many times slower than their stored baseline
+DEFAULT_BENCHMARK_THRESHOLD = 2.0
+
+
+# Options must be registered from a conftest pytest loads at startup
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Write this run's timings to baselines.json instead of comparing.",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=DEFAULT_BENCHMARK_THRESHOLD,
+        help="Fail when a benchmark is this many times slower than its baseline.",
+    )
+
+
+def play_frames(
+    n_frames: int = 120, seed: int = 0
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """A cleaned synthetic play with the field names PlayAnimator expects."""
+    game_data, play_data, tracking_data = generate_play(n_frames=n_frames, seed=seed)
+    return (
+        to_field_names(game_data, Game),
+        to_field_names(play_data, Play),
+        to_field_names(clean_tracking_data(tracking_data), TrackingData),
+    )
+
+
+class SyntheticBackend:
+    """In-memory DataBackend over one synthetic week, game and set of plays."""
+
+    def __init__(self: Self, n_frames: int = 120, clean: bool = True) -> None:
+        self.game = generate_game(GAME_ID)
+        frames = [
+            generate_play(GAME_ID, play_id, n_frames=n_frames, seed=play_id)
+            for play_id in range(1, PLAYS_PER_GAME + 1)
+        ]
+        self.plays = pd.concat([play for _, play, _ in frames], ignore_index=True)
+        self.tracking = pd.concat(
+            [tracking for _, _, tracking in frames], ignore_index=True
+        )
+        if clean:
+            # Stored the way app.cli.ingest loads it
+            self.tracking = clean_tracking_data(self.tracking)
+        self.summaries = generate_play_summaries([play for _, play, _ in frames])
+
+    async def read_weeks(self: Self) -> pd.DataFrame:
+        return pd.DataFrame({"week": [WEEK]})
+
+    async def read_games(self: Self, week: int) -> pd.DataFrame:
+        return self.game if week == WEEK else self.game.iloc[:0]
+
+    async def read_plays(self: Self, game_id: int) -> pd.DataFrame:
+        return self.summaries if game_id == GAME_ID else self.summaries.iloc[:0]
+
+    async def read_play(
+        self: Self, game_id: int, play_id: int
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        return await self.read_play_batch([(game_id, play_id)])
+
+    async def read_play_batch(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        requested = pd.MultiIndex.from_tuples(keys)
+        play_data = self.plays[
+            pd.MultiIndex.from_frame(self.plays[["gameid", "playid"]]).isin(requested)
+        ]
+        tracking_data = self.tracking[
+            pd.MultiIndex.from_frame(self.tracking[["gameid", "playid"]]).isin(
+                requested
+            )
+        ]
+        game_data = self.game[self.game["gameid"].isin(play_data["gameid"])]
+        return game_data.copy(), play_data.copy(), tracking_data.copy()
+
+    async def read_play_metadata(
+        self: Self, keys: list[tuple[int, int]]
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        game_data, play_data, _ = await self.read_play_batch(keys)
+        return game_data, play_data
+
+    async def stream_tracking(
+        self: Self, keys: list[tuple[int, int]], chunk_rows: int
+    ) -> AsyncIterator[pd.DataFrame]:
+        # In request order, with chunks that split plays like a cursor would
+        tracking_data = pd.concat(
+            [(await self.read_play(*key))[2] for key in keys], ignore_index=True
+        )
+        for start in range(0, len(tracking_data), chunk_rows):
+            yield tracking_data.iloc[start : start + chunk_rows]
+
+
+@pytest.fixture(scope="session")
+def synthetic_backend() -> SyntheticBackend:
+    return SyntheticBackend()
+
+
+@pytest.fixture(scope="module")
+def client(
+    synthetic_backend: SyntheticBackend, tmp_path_factory: pytest.TempPathFactory
+) -> Generator[TestClient, None, None]:
+    # Caches that hold nothing, so every request renders and reads its play
+    no_cache = FigureCache(tmp_path_factory.mktemp("figures"), 0, 0)
+    no_game_cache = TTLCache(0, 0)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(figures, "get_figure_cache", lambda: no_cache)
+        monkeypatch.setattr(crud, "get_game_cache", lambda: no_game_cache)
+        app.dependency_overrides[get_backend] = lambda: synthetic_backend
+        with TestClient(app) as client:
+            yield client
+        app.dependency_overrides.clear()
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.modules.animation import (
+    AnimationConfig,
+    AnimationConfigError,
+    PlayAnimator,
+    PlayTracking,
+)
+from app.schemas.tracking import TrackingData
+from tests.conftest import play_frames
+
+N_FRAMES = 30
+
+
+@pytest.fixture(scope="module")
+def frames() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    return play_frames(N_FRAMES)
+
+
+@pytest.mark.parametrize(
+    ("config", "expected", "stride"),
+    [
+        (AnimationConfig(), range(1, 31), 1),
+        (AnimationConfig(frame_stride=4), range(1, 31, 4), 4),
+        (AnimationConfig(max_frames=10), range(1, 31, 3), 3),
+        (AnimationConfig(max_frames=100), range(1, 31), 1),
+        (AnimationConfig(first_frame=5, last_frame=12), range(5, 13), 1),
+        (AnimationConfig(first_frame=25), range(25, 31), 1),
+        (
+            AnimationConfig(first_frame=5, last_frame=14, max_frames=4),
+            range(5, 15, 3),
+            3,
+        ),
+        (AnimationConfig(frame_stride=2, max_frames=30), range(1, 31, 2), 2),
+    ],
+)
+def test_frame_selection(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+    config: AnimationConfig,
+    expected: range,
+    stride: int,
+) -> None:
+    animator = PlayAnimator(*frames, config=config)
+    np.testing.assert_array_equal(animator.frame_ids, list(expected))
+    assert animator.frame_stride == stride
+    assert animator.frame_duration == config.frame_duration * stride
+
+    fig = animator.create_animation()
+    steps = fig.layout.sliders[0].steps
+    assert [step.label for step in steps] == [str(f) for f in expected]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"frame_stride": 0},
+        {"max_frames": 0},
+        {"first_frame": 20, "last_frame": 10},
+    ],
+)
+def test_config_rejects_bad_options(options: dict) -> None:
+    with pytest.raises(AnimationConfigError):
+        AnimationConfig(**options)
+
+
+def test_empty_frame_window(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+) -> None:
+    with pytest.raises(AnimationConfigError):
+        PlayAnimator(*frames, config=AnimationConfig(first_frame=N_FRAMES + 1))
+
+
+@pytest.mark.parametrize(
+    ("renderer", "redraw", "expected"),
+    [("svg", False, False), ("svg", True, True), ("webgl", False, True)],
+)
+def test_webgl_redraws(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+    renderer: str,
+    redraw: bool,
+    expected: bool,
+) -> None:
+    config = AnimationConfig(renderer=renderer, redraw=redraw)
+    fig = PlayAnimator(*frames, config=config).create_animation()
+    play = fig.layout.updatemenus[0].buttons[0]
+    assert play.args[1]["frame"]["redraw"] is expected
+    for step in fig.layout.sliders[0].steps:
+        assert step.args[1]["frame"]["redraw"] is expected
+
+
+def test_play_tracking_football(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+) -> None:
+    tracking_data = frames[2]
+    # Players listed last appear first, so rows are not in player order
+    tracking = PlayTracking.from_dataframe(tracking_data.iloc[::-1])
+
+    for player, nfl_id in enumerate(tracking.nfl_ids):
+        rows = tracking_data[tracking_data["nfl_id"] == nfl_id]
+        assert tracking.clubs[player] == rows["club"].iloc[0]
+        assert tracking.display_names[player] == rows["display_name"].iloc[0]
+        np.testing.assert_array_equal(tracking.x[:, player], rows["x"])
+    assert tracking.clubs[list(tracking.nfl_ids).index(0)] == "football"
+
+
+def test_play_tracking_rejects_missing_ids(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+) -> None:
+    tracking_data = frames[2].copy()
+    tracking_data["nfl_id"] = tracking_data["nfl_id"].replace(0, None)
+    with pytest.raises(ValueError, match="nfl_id"):
+        PlayTracking.from_dataframe(tracking_data)
+
+
+def test_play_tracking_rejects_duplicate_rows(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+) -> None:
+    tracking_data = frames[2]
+    duplicated = pd.concat([tracking_data, tracking_data.iloc[[5]]])
+    with pytest.raises(ValueError, match="More than one"):
+        PlayTracking.from_dataframe(duplicated)
+
+
+def test_tracking_data_round_trip(
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+) -> None:
+    tracking = PlayTracking.from_dataframe(frames[2])
+    rows = TrackingData.from_play_tracking(tracking)
+    assert len(rows) == len(frames[2])
+    assert {row.model_dump_json() for row in rows} == {
+        TrackingData.model_validate(row).model_dump_json()
+        for row in frames[2].to_dict(orient="records")
+    }
+
+    decoded = TrackingData.to_play_tracking(rows)
+    assert (decoded.game_id, decoded.play_id) == (tracking.game_id, tracking.play_id)
+    assert decoded.play_direction == tracking.play_direction
+    np.testing.assert_array_equal(decoded.frame_ids, tracking.frame_ids)
+    np.testing.assert_array_equal(decoded.nfl_ids, tracking.nfl_ids)
+    np.testing.assert_array_equal(decoded.clubs, tracking.clubs)
+    np.testing.assert_array_equal(decoded.display_names, tracking.display_names)
+    for column in PlayTracking.KINEMATICS:
+        np.testing.assert_array_equal(
+            getattr(decoded, column), getattr(tracking, column)
+        )
@@ -1 +1,418 @@
-# Tests for the API
+import asyncio
+import json
+import math
+import time
+from pathlib import Path
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import get_settings
+from app.dependencies import get_backend
+from app.cli.ingest import ParquetSink
+from app.main import app
+from app.modules.animation import AnimationConfig, PlayAnimator
+from app.services.backends.parquet import ParquetBackend
+from app.services.crud import get_game_cache
+from app.services import crud, figures
+from app.services.figures import FigureCache, stream_figure
+from app.services.serialization import COMPACT_MEDIA_TYPE, compact_to_play_tracking
+from app.utils.profiling import ProfilingMiddleware
+from tests.conftest import (
+    GAME_ID,
+    PLAYS_PER_GAME,
+    WEEK,
+    SyntheticBackend,
+    play_frames,
+)
+
+PLAY_ID = 1
+FIGURE_PARAMS = {"static_field": True, "redraw": False}
+
+
+def ndjson(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.parametrize(
+    "url", ["/api/weeks", f"/api/games/{WEEK}", f"/api/plays/{GAME_ID}"]
+)
+def test_metadata_etag(client: TestClient, url: str) -> None:
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert not cached.content
+
+    stale = client.get(url, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == response.content
+
+
+def test_play_batch_lines(
+    client: TestClient, synthetic_backend: SyntheticBackend
+) -> None:
+    response = client.post("/api/plays/batch", json={"game_id": GAME_ID})
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+
+    plays = ndjson(response.content)
+    assert len(plays) == len(synthetic_backend.plays)
+    for play in plays:
+        assert len(play["play_data"]) == 1
+        assert play["tracking_data"]
+
+
+def test_play_batch_matches_play(client: TestClient) -> None:
+    # Requested plays come first, and a play also in the game is sent once
+    response = client.post(
+        "/api/plays/batch",
+        json={"plays": [{"game_id": GAME_ID, "play_id": 2}], "game_id": GAME_ID},
+    )
+    plays = ndjson(response.content)
+    assert plays[0] == client.get(f"/api/play/{GAME_ID}/2").json()
+    play_ids = [play["play_data"][0]["playid"] for play in plays]
+    assert sorted(play_ids) == sorted(set(play_ids))
+
+
+def test_play_batch_missing_plays(client: TestClient) -> None:
+    response = client.post(
+        "/api/plays/batch",
+        json={
+            "plays": [
+                {"game_id": GAME_ID, "play_id": 999},
+                {"game_id": 1, "play_id": 1},
+                {"game_id": GAME_ID, "play_id": PLAY_ID},
+            ]
+        },
+    )
+    assert response.status_code == 200
+
+    unknown_play, unknown_game, play = ndjson(response.content)
+    assert unknown_play["game_data"] and not unknown_play["play_data"]
+    assert not unknown_play["tracking_data"]
+    assert unknown_game == {"game_data": [], "play_data": [], "tracking_data": []}
+    assert play["tracking_data"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {},
+        {"plays": []},
+        {"plays": [{"game_id": GAME_ID}]},
+        {"plays": [{"game_id": "x", "play_id": PLAY_ID}]},
+        {"game_id": "x"},
+    ],
+)
+def test_play_batch_bad_keys(client: TestClient, body: dict) -> None:
+    assert client.post("/api/plays/batch", json=body).status_code == 422
+
+
+def test_fast_json_matches(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    play_url = f"/api/play/{GAME_ID}/{PLAY_ID}"
+    play = client.get(play_url).content
+    batch = client.post("/api/plays/batch", json={"game_id": GAME_ID}).content
+
+    monkeypatch.setattr(get_settings(), "fast_json", True)
+    assert client.get(play_url).content == play
+    assert client.post("/api/plays/batch", json={"game_id": GAME_ID}).content == batch
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_batch_stream_matches(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, fast_json: bool
+) -> None:
+    monkeypatch.setattr(get_settings(), "fast_json", fast_json)
+    expected = client.post("/api/plays/batch", json={"game_id": GAME_ID}).content
+
+    # Small enough that plays are split across chunks
+    monkeypatch.setattr(get_settings(), "tracking_stream_rows", 1000)
+    response = client.post("/api/plays/batch", json={"game_id": GAME_ID})
+    assert response.content == expected
+
+
+@pytest.fixture(scope="module")
+def parquet_backend(
+    synthetic_backend: SyntheticBackend, tmp_path_factory: pytest.TempPathFactory
+) -> ParquetBackend:
+    """The synthetic game, written the way app.cli.ingest writes a Parquet store."""
+    root = tmp_path_factory.mktemp("parquet")
+    sink = ParquetSink(root)
+    sink.prepare()
+    sink.write_games(synthetic_backend.game.assign(week=WEEK))
+    summaries = synthetic_backend.summaries[["playid", "gameclock"]]
+    sink.write_plays(synthetic_backend.plays.merge(summaries, on="playid"))
+    # In two parts, as ingest flushes a game's rows in chunks
+    tracking = synthetic_backend.tracking
+    first = tracking["playid"] <= PLAYS_PER_GAME // 2
+    sink.write_tracking(WEEK, GAME_ID, tracking[first], replace=True)
+    sink.write_tracking(WEEK, GAME_ID, tracking[~first], replace=False)
+    return ParquetBackend(root)
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_parquet_batch_stream_matches(
+    client: TestClient,
+    parquet_backend: ParquetBackend,
+    monkeypatch: pytest.MonkeyPatch,
+    fast_json: bool,
+) -> None:
+    monkeypatch.setattr(get_settings(), "fast_json", fast_json)
+    expected = client.post("/api/plays/batch", json={"game_id": GAME_ID}).content
+
+    monkeypatch.setitem(app.dependency_overrides, get_backend, lambda: parquet_backend)
+    chunked = client.post("/api/plays/batch", json={"game_id": GAME_ID}).content
+    monkeypatch.setattr(get_settings(), "tracking_stream_rows", 1000)
+    streamed = client.post("/api/plays/batch", json={"game_id": GAME_ID}).content
+
+    assert chunked == expected
+    # Parquet streams a game's plays in stored order rather than requested order
+    assert sorted(streamed.splitlines()) == sorted(chunked.splitlines())
+
+
+class CountingBackend(SyntheticBackend):
+    """Counts the reads that fetch tracking rows."""
+
+    def __init__(self: "CountingBackend") -> None:
+        super().__init__()
+        self.tracking_reads = 0
+
+    async def read_play_batch(
+        self: "CountingBackend", keys: list[tuple[int, int]]
+    ) -> tuple:
+        self.tracking_reads += 1
+        return await super().read_play_batch(keys)
+
+
+def use_game_cache(monkeypatch: pytest.MonkeyPatch, entries: int) -> None:
+    """Swap the client's disabled game cache for one built from the settings."""
+    monkeypatch.setattr(get_settings(), "game_cache_entries", entries)
+    get_game_cache.cache_clear()
+    monkeypatch.setattr(crud, "get_game_cache", get_game_cache)
+
+
+def prefetch(client: TestClient, backend: CountingBackend) -> None:
+    """List the game's plays, and wait for the game load it starts."""
+    assert client.get(f"/api/plays/{GAME_ID}").status_code == 200
+    while (backend, GAME_ID) in crud._game_loads:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("entries", [0, 4])
+def test_game_prefetch(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, entries: int
+) -> None:
+    use_game_cache(monkeypatch, entries)
+    backend = CountingBackend()
+    monkeypatch.setitem(app.dependency_overrides, get_backend, lambda: backend)
+    urls = [
+        f"/api/play/{GAME_ID}/{play_id}" for play_id in range(1, PLAYS_PER_GAME + 1)
+    ]
+    expected = [client.get(url).content for url in urls]
+
+    reads = backend.tracking_reads
+    prefetch(client, backend)
+    assert [client.get(url).content for url in urls] == expected
+    if entries:
+        # One read for the whole game, and none for its plays
+        assert backend.tracking_reads == reads + 1
+        assert sorted(crud.get_game_cache().get((backend, GAME_ID))) == list(
+            range(1, PLAYS_PER_GAME + 1)
+        )
+    else:
+        assert backend.tracking_reads == reads + PLAYS_PER_GAME
+        assert len(crud.get_game_cache()) == 0
+    get_game_cache.cache_clear()
+
+
+def test_game_cache_eviction(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    use_game_cache(monkeypatch, 1)
+    # The cache is keyed by backend and game, so two backends hold two games
+    first, second = CountingBackend(), CountingBackend()
+    for backend in (first, second):
+        monkeypatch.setitem(app.dependency_overrides, get_backend, lambda: backend)
+        prefetch(client, backend)
+
+    cache = crud.get_game_cache()
+    assert cache.get((first, GAME_ID)) is None
+    assert cache.get((second, GAME_ID)) is not None
+    reads = first.tracking_reads
+    monkeypatch.setitem(app.dependency_overrides, get_backend, lambda: first)
+    assert client.get(f"/api/play/{GAME_ID}/{PLAY_ID}").status_code == 200
+    assert first.tracking_reads == reads + 1
+    get_game_cache.cache_clear()
+
+
+def test_play_compact(client: TestClient) -> None:
+    url = f"/api/play/{GAME_ID}/{PLAY_ID}"
+    response = client.get(
+        url, headers={"Accept": COMPACT_MEDIA_TYPE, "Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == COMPACT_MEDIA_TYPE
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept, Accept-Encoding"
+
+    _, _, tracking = compact_to_play_tracking(response.content)
+    rows = client.get(url).json()["tracking_data"]
+    assert len(tracking) == len(rows)
+    assert int(response.headers["Content-Length"]) * 10 < len(client.get(url).content)
+
+
+def test_figure_stream_matches_figure(client: TestClient) -> None:
+    url = f"/api/play/{GAME_ID}/{PLAY_ID}/figure"
+    expected = client.get(url, params=FIGURE_PARAMS).json()
+
+    response = client.get(f"{url}/stream", params={**FIGURE_PARAMS, "batch_size": 7})
+    assert response.status_code == 200
+    first, *batches = ndjson(response.content)
+    figure = first["figure"]
+    assert "frames" not in figure
+    for batch in batches:
+        assert 0 < len(batch["frames"]) <= 7
+        figure.setdefault("frames", []).extend(batch["frames"])
+    assert figure == expected
+
+
+@pytest.mark.parametrize("static_field", [False, True])
+def test_figure_stream_caches_figure(tmp_path: Path, static_field: bool) -> None:
+    config = AnimationConfig(static_field=static_field)
+    animator = PlayAnimator(*play_frames(30), config=config)
+    cache = FigureCache(tmp_path, 1, 10**9)
+
+    lines = list(stream_figure(animator, 7, cache, "key"))
+    assert len(lines) == 1 + math.ceil(30 / 7)
+    assert cache.get("key") == animator.create_animation().to_json().encode()
+
+
+# Failing on the first frame, or partway through the second batch
+@pytest.mark.parametrize(("fail_after", "n_lines"), [(0, 0), (10, 2)])
+def test_figure_stream_error_line(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fail_after: int, n_lines: int
+) -> None:
+    animator = PlayAnimator(*play_frames(30))
+    create_frame = animator._create_frame
+    calls = iter(range(30))
+
+    def failing_frame(frame_id: int) -> object:
+        if next(calls) == fail_after:
+            raise RuntimeError("render failed")
+        return create_frame(frame_id)
+
+    monkeypatch.setattr(animator, "_create_frame", failing_frame)
+    cache = FigureCache(tmp_path, 1, 10**9)
+
+    *lines, last = ndjson(b"".join(stream_figure(animator, 7, cache, "key")))
+    assert last == {"error": "render failed"}
+    assert len(lines) == n_lines
+    assert cache.get("key") is None
+
+
+def test_concurrent_figures_render_once(
+    synthetic_backend: SyntheticBackend,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    no_cache = FigureCache(tmp_path, 0, 0)
+    monkeypatch.setattr(figures, "get_figure_cache", lambda: no_cache)
+    render_figure, renders = figures.render_figure, []
+
+    def slow_render(*args: object) -> bytes:
+        renders.append(args)
+        time.sleep(0.2)
+        return render_figure(*args)
+
+    monkeypatch.setattr(figures, "render_figure", slow_render)
+    config = AnimationConfig(**FIGURE_PARAMS)
+
+    async def request_figures() -> list:
+        # A prefetch starts rendering, then the same figure is asked for again
+        prefetch = asyncio.create_task(
+            figures.get_play_figure(synthetic_backend, GAME_ID, PLAY_ID, config)
+        )
+        while not figures._renders:
+            await asyncio.sleep(0.01)
+        return await asyncio.gather(
+            prefetch,
+            figures.get_play_figure(synthetic_backend, GAME_ID, PLAY_ID, config),
+            figures.get_play_figure_stream(
+                synthetic_backend, GAME_ID, PLAY_ID, config, 10
+            ),
+        )
+
+    figure, again, stream = asyncio.run(request_figures())
+    assert len(renders) == 1
+    assert again == figure
+    assert list(stream) == [b'{"figure":' + figure + b"}\n"]
+    assert not figures._renders
+
+
+def test_figure_stream_rejects_bad_batch_size(client: TestClient) -> None:
+    url = f"/api/play/{GAME_ID}/{PLAY_ID}/figure/stream"
+    assert client.get(url, params={"batch_size": 0}).status_code == 422
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"frame_stride": 0},
+        {"max_frames": 0},
+        {"first_frame": 20, "last_frame": 10},
+        {"first_frame": 1000},
+        {"last_frame": 0},
+    ],
+)
+def test_figure_rejects_bad_frames(
+    client: TestClient, params: dict, stream: bool
+) -> None:
+    url = f"/api/play/{GAME_ID}/{PLAY_ID}/figure" + ("/stream" if stream else "")
+    response = client.get(url, params=params)
+    assert response.status_code == 422
+    assert response.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    ("path", "headers"),
+    [
+        ("", {}),
+        ("", {"Accept": COMPACT_MEDIA_TYPE}),
+        ("/figure", {}),
+    ],
+)
+def test_uncleaned_rows_fail(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, path: str, headers: dict
+) -> None:
+    backend = SyntheticBackend(n_frames=10, clean=False)
+    monkeypatch.setitem(app.dependency_overrides, get_backend, lambda: backend)
+    response = client.get(f"/api/play/{GAME_ID}/{PLAY_ID}{path}", headers=headers)
+    assert response.status_code == 500
+    assert "app.cli.ingest" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_profiling_middleware(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, enabled: bool
+) -> None:
+    monkeypatch.setattr(get_settings(), "profiling_enabled", enabled)
+    monkeypatch.setattr(get_settings(), "profile_dir", tmp_path)
+    ping = FastAPI()
+    ping.get("/ping")(lambda: {"ok": True})
+    ping.add_middleware(ProfilingMiddleware)
+
+    with TestClient(ping) as client:
+        assert client.get("/ping").json() == {"ok": True}
+        inline = client.get("/ping", params={"profile": "inline"})
+        profiled = client.get("/ping", headers={"X-Profile": "file"})
+
+    if enabled:
+        assert "cumulative" in inline.text
+        assert Path(profiled.headers["X-Profile-Path"]).exists()
+    else:
+        assert inline.json() == profiled.json() == {"ok": True}
+        assert "X-Profile-Path" not in profiled.headers
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).parents[1]
+
+# Packages each module must leave to be imported on first use
+DEFERRED_IMPORTS = {
+    "app.main": [
+        "asyncpg",
+        "matplotlib",
+        "nfl_data_py",
+        "psycopg2",
+        "seaborn",
+        "sqlalchemy",
+        "streamlit",
+    ],
+    "app.modules.animation": [
+        "fastapi",
+        "matplotlib",
+        "nfl_data_py",
+        "seaborn",
+        "sqlalchemy",
+        "streamlit",
+    ],
+    "app.schemas.tracking": ["plotly", "sqlalchemy", "streamlit"],
+}
+
+
+def import_in_subprocess(module: str) -> str:
+    """Import a module in a fresh interpreter and list the packages it loaded."""
+    code = f"import sys, {module}; print(*sys.modules)"
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.mark.parametrize("module", sorted(DEFERRED_IMPORTS))
+def test_heavy_imports_are_deferred(module: str) -> None:
+    packages = {name.split(".")[0] for name in import_in_subprocess(module).split()}
+    loaded = packages & set(DEFERRED_IMPORTS[module])
+    assert not loaded, f"importing {module} loads {sorted(loaded)}"
+
+
+def test_settings_are_deferred() -> None:
+    # Reading the environment and .env waits for the API to start
+    code = (
+        "import app.main, app.config; "
+        "print(app.config.get_settings.cache_info().currsize)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert output.strip() == "0"
@@ -0,0 +1,138 @@
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+from app.modules.animation.types import PlayTracking
+from app.schemas.play_response import PlayResponse
+from app.schemas.tracking import TrackingData
+from app.services.cleaning import clean_tracking_data
+from app.services.serialization import (
+    COMPACT_HEADER_LENGTH,
+    COMPACT_MAGIC,
+    _floats_fit_orjson,
+    compact_to_play_tracking,
+    play_frames_to_json,
+    play_tracking_to_compact,
+)
+from app.utils.synthetic import generate_play
+from tests.conftest import play_frames
+
+
+@pytest.fixture
+def play() -> tuple:
+    game_data, play_data, tracking_data = play_frames(40)
+    return game_data, play_data, PlayTracking.from_dataframe(tracking_data)
+
+
+def compact_dtypes(content: bytes) -> dict[str, str]:
+    """Array names and dtypes from a compact payload's header."""
+    offset = len(COMPACT_MAGIC)
+    (length,) = COMPACT_HEADER_LENGTH.unpack_from(content, offset)
+    offset += COMPACT_HEADER_LENGTH.size
+    header = orjson.loads(content[offset : offset + length])
+    return {name: dtype for name, dtype, _ in header["arrays"]}
+
+
+def assert_round_trip(play: tuple) -> bytes:
+    game_data, play_data, tracking = play
+    content = play_tracking_to_compact(game_data, play_data, tracking)
+    decoded_game, decoded_play, decoded = compact_to_play_tracking(content)
+
+    assert decoded_game.to_dict("records") == game_data.to_dict("records")
+    assert decoded_play.to_dict("records") == play_data.to_dict("records")
+    assert (decoded.game_id, decoded.play_id) == (tracking.game_id, tracking.play_id)
+    assert decoded.play_direction == tracking.play_direction
+    np.testing.assert_array_equal(decoded.frame_ids, tracking.frame_ids)
+    np.testing.assert_array_equal(decoded.nfl_ids, tracking.nfl_ids)
+    np.testing.assert_array_equal(decoded.clubs, tracking.clubs)
+    np.testing.assert_array_equal(decoded.display_names, tracking.display_names)
+    for column in PlayTracking.KINEMATICS:
+        # Values are kept to the hundredth, and missing values stay missing
+        np.testing.assert_allclose(
+            getattr(decoded, column), getattr(tracking, column), atol=0.005
+        )
+    return content
+
+
+def test_compact_round_trip(play: tuple) -> None:
+    assert_round_trip(play)
+
+
+def test_compact_missing_values(play: tuple) -> None:
+    tracking = play[2]
+    # A player missing from some frames, and a single missing reading
+    for column in PlayTracking.KINEMATICS:
+        getattr(tracking, column)[5:9, 3] = np.nan
+    tracking.s[0, 0] = np.nan
+
+    dtypes = compact_dtypes(assert_round_trip(play))
+    assert "x_missing" in dtypes
+    assert "s_missing" in dtypes
+    assert "y_missing" in dtypes
+    assert {dtypes[column] for column in PlayTracking.KINEMATICS} == {"<i2"}
+
+
+def test_compact_angle_wrap(play: tuple) -> None:
+    tracking = play[2]
+    # Turning through north, with a gap, from a start that overflows int16
+    n_frames = len(tracking.frame_ids)
+    tracking.dir[:, 1] = (350.0 + 2.5 * np.arange(n_frames)) % 360
+    tracking.dir[10:14, 1] = np.nan
+    tracking.dir[:, 2] = 359.99
+
+    dtypes = compact_dtypes(assert_round_trip(play))
+    assert dtypes["dir"] == "<i2"
+
+
+def test_compact_full_turn(play: tuple) -> None:
+    game_data, play_data, tracking = play
+    tracking.dir[3, 1] = 360.0
+
+    content = play_tracking_to_compact(game_data, play_data, tracking)
+    decoded = compact_to_play_tracking(content)[2]
+    assert decoded.dir[3, 1] == 0.0
+
+
+def test_compact_int32_overflow(play: tuple) -> None:
+    tracking = play[2]
+    # A step over 327.67 does not fit in int16
+    tracking.a[10, 2] = 400.0
+
+    dtypes = compact_dtypes(assert_round_trip(play))
+    assert dtypes["a"] == "<i4"
+    assert dtypes["x"] == "<i2"
+
+
+def test_compact_rejects_other_payloads() -> None:
+    with pytest.raises(ValueError):
+        compact_to_play_tracking(b"{}")
+
+
+@pytest.mark.parametrize(
+    ("column", "value", "fits_orjson"),
+    [
+        ("x", 9.99e15, True),
+        ("x", 1e16, False),
+        ("a", -2.5e20, False),
+        ("s", 1e-7, True),
+        ("s", np.nan, True),
+        ("displayname", 'Zoë Ñúñez 鈴木 "Jr."', True),
+    ],
+)
+def test_play_frames_to_json_matches_pydantic(
+    column: str, value: float | str, fits_orjson: bool
+) -> None:
+    game_data, play_data, tracking_data = generate_play(n_frames=5)
+    tracking_data = clean_tracking_data(tracking_data)
+    tracking_data.loc[3, column] = value
+    assert _floats_fit_orjson(tracking_data, TrackingData) == fits_orjson
+
+    expected = PlayResponse.model_validate({
+        "game_data": game_data.to_dict(orient="records"),
+        "play_data": play_data.to_dict(orient="records"),
+        "tracking_data": tracking_data.to_dict(orient="records"),
+    }).model_dump_json(by_alias=True)
+    content = play_frames_to_json(game_data, play_data, tracking_data)
+    assert content == expected.encode()
+    if isinstance(value, float) and np.isnan(value):
+        assert orjson.loads(content)["tracking_data"][3][column] is None